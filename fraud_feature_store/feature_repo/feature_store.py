@@ -1,11 +1,30 @@
 # feature_repo/feature_store.py
 from datetime import timedelta
-from feast import Entity, FeatureService, FeatureView, Field, FileSource
-from feast.types import Float32, Int64
+from feast import (
+    Entity,
+    FeatureService,
+    FeatureView,
+    Field,
+    FileSource,
+    PushSource,
+)
+from feast.types import Array, Float32, Float64, Int64
+from feast.value_type import ValueType
 
 # --- 1. Define the Entity ---
 # The primary key for retrieving features (what we are predicting on)
 user = Entity(name="user_id", description="ID of the user making a transaction")
+# Further entities a transaction can be looked up by, each with its own view
+merchant = Entity(
+    name="merchant_id",
+    value_type=ValueType.INT64,
+    description="ID of the merchant receiving a transaction",
+)
+device = Entity(
+    name="device_id",
+    value_type=ValueType.STRING,
+    description="Fingerprint of the device a transaction was made from",
+)
 
 # --- 2. Define the Data Source (Mock Offline Data) ---
 # In a real system, this would point to a data warehouse (Snowflake, BigQuery, etc.)
@@ -16,6 +35,31 @@ user_transactions_source = FileSource(
     created_timestamp_column="created_timestamp",
 )
 
+# Live transactions pushed by the service's /ingest endpoints, kept apart from
+# the batch aggregates above as hourly buckets (and optionally appended here)
+user_live_transactions_source = FileSource(
+    path="data/user_live_transactions.parquet",
+    timestamp_field="event_timestamp",
+    created_timestamp_column="created_timestamp",
+)
+
+user_live_transactions_push_source = PushSource(
+    name="user_live_transactions_push",
+    batch_source=user_live_transactions_source,
+)
+
+merchant_transactions_source = FileSource(
+    path="data/merchant_transactions.parquet",
+    timestamp_field="event_timestamp",
+    created_timestamp_column="created_timestamp",
+)
+
+device_source = FileSource(
+    path="data/device_features.parquet",
+    timestamp_field="event_timestamp",
+    created_timestamp_column="created_timestamp",
+)
+
 # --- 3. Define the Feature View (The Feature Logic) ---
 # A collection of features related to the user entity
 user_transaction_fv = FeatureView(
@@ -25,15 +69,69 @@ user_transaction_fv = FeatureView(
     schema=[
         Field(name="transaction_count_7d", dtype=Int64),
         Field(name="avg_transaction_amount_7d", dtype=Float32),
+        Field(name="std_transaction_amount_7d", dtype=Float32),
     ],
     online=True,  # Critical: Makes features available for real-time serving
     source=user_transactions_source,
     tags={},
 )
 
+# Transactions ingested since the batch aggregates were computed, per hour:
+# bucket i covers hour live_bucket_hour - i (hours since the epoch). The
+# service adds the buckets newer than the user's batch row at read time, so
+# pushes never overwrite materialized aggregates and live data ages out
+user_live_transaction_fv = FeatureView(
+    name="user_live_transaction_features",
+    entities=[user],
+    ttl=timedelta(days=8),
+    schema=[
+        Field(name="live_bucket_hour", dtype=Int64),
+        Field(name="live_counts", dtype=Array(Int64)),
+        Field(name="live_sums", dtype=Array(Float64)),
+        Field(name="live_sum_sqs", dtype=Array(Float64)),
+    ],
+    online=True,
+    source=user_live_transactions_push_source,
+    tags={},
+)
+
+# Merchant and device views are served alongside the user view; /predict
+# looks each of them up concurrently when the request names the entity
+merchant_transaction_fv = FeatureView(
+    name="merchant_transaction_features",
+    entities=[merchant],
+    ttl=timedelta(weeks=52),
+    schema=[
+        Field(name="merchant_transaction_count_7d", dtype=Int64),
+        Field(name="merchant_fraud_rate_30d", dtype=Float32),
+    ],
+    online=True,
+    source=merchant_transactions_source,
+    tags={},
+)
+
+device_fv = FeatureView(
+    name="device_features",
+    entities=[device],
+    ttl=timedelta(weeks=52),
+    schema=[
+        Field(name="device_user_count_30d", dtype=Int64),
+        Field(name="device_age_days", dtype=Int64),
+    ],
+    online=True,
+    source=device_source,
+    tags={},
+)
+
 # --- 4. Define a Feature Service ---
 # Groups the features needed for a specific model (our fraud model)
 fraud_feature_service = FeatureService(
     name="fraud_prediction_service",
     features=[user_transaction_fv],
 )
+
+# Every entity's features, for training a model on the full request context
+fraud_multi_entity_service = FeatureService(
+    name="fraud_multi_entity_service",
+    features=[user_transaction_fv, merchant_transaction_fv, device_fv],
+)
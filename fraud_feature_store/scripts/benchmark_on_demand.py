@@ -0,0 +1,63 @@
+# scripts/benchmark_on_demand.py
+"""Micro-benchmark for request-time features (src/on_demand.py).
+
+Run from the fraud_feature_store directory:
+    uv run scripts/benchmark_on_demand.py
+"""
+
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.on_demand import compute_request_features, request_features_for  # noqa: E402
+
+BATCH_SIZES = [1, 100, 10_000, 1_000_000]
+REPEATS = 5
+
+
+def benchmark_batches():
+    """Per-row cost of the vectorized transform for growing batch sizes."""
+    rng = np.random.default_rng(0)
+    for batch_size in BATCH_SIZES:
+        amount = rng.uniform(1.0, 5000.0, batch_size)
+        avg = rng.uniform(50.0, 1000.0, batch_size)
+        std = avg * rng.uniform(0.2, 0.8, batch_size)
+        count = rng.integers(0, 100, batch_size)
+
+        number = max(1, 100_000 // batch_size)
+        best = min(
+            timeit.repeat(
+                lambda: compute_request_features(amount, avg, std, count),
+                number=number,
+                repeat=REPEATS,
+            )
+        )
+        per_row_us = best / number / batch_size * 1e6
+        print(f"batch={batch_size:>9,}  {per_row_us:10.4f} us/row")
+
+
+def benchmark_single_request():
+    """End-to-end cost of the helper /predict calls once per request."""
+    features = {
+        "transaction_count_7d": [37],
+        "avg_transaction_amount_7d": [296.62],
+        "std_transaction_amount_7d": [120.0],
+    }
+    number = 10_000
+    best = min(
+        timeit.repeat(
+            lambda: request_features_for(500.0, features),
+            number=number,
+            repeat=REPEATS,
+        )
+    )
+    print(f"single request (/predict path)  {best / number * 1e6:.2f} us")
+
+
+if __name__ == "__main__":
+    benchmark_batches()
+    benchmark_single_request()
@@ -2,11 +2,22 @@
 import pandas as pd
 import numpy as np
 import os
+import pyarrow as pa
+import pyarrow.parquet as pq
 from datetime import datetime, timedelta
 
 NUM_USERS = 5000
 NUM_TRANSACTIONS = 250000
+NUM_MERCHANTS = 500
+NUM_DEVICES = 8000
 OUTPUT_FILE = "fraud_feature_store/feature_repo/data/user_transactions.parquet"
+MERCHANT_OUTPUT_FILE = (
+    "fraud_feature_store/feature_repo/data/merchant_transactions.parquet"
+)
+DEVICE_OUTPUT_FILE = "fraud_feature_store/feature_repo/data/device_features.parquet"
+LIVE_OUTPUT_FILE = (
+    "fraud_feature_store/feature_repo/data/user_live_transactions.parquet"
+)
 
 
 def generate_transaction_data():
@@ -36,6 +47,12 @@ def generate_transaction_data():
         50.0, 500.0, NUM_TRANSACTIONS
     ) * (1 + (df["user_id"] - 1001) / 50)
 
+    # std_transaction_amount_7d: spread of amounts around the 7-day average,
+    # used by the service for request-time z-scores
+    df["std_transaction_amount_7d"] = df[
+        "avg_transaction_amount_7d"
+    ] * np.random.uniform(0.2, 0.8, NUM_TRANSACTIONS)
+
     # 3. Add a placeholder 'created' column (Feast requires it in some configurations)
     df["created_timestamp"] = now
 
@@ -51,6 +68,61 @@ def generate_transaction_data():
     print(df.head())
 
 
+def generate_merchant_data():
+    """Generates one row of mock merchant aggregates per merchant."""
+    now = datetime.now()
+    df = pd.DataFrame()
+    df["merchant_id"] = np.arange(1, 1 + NUM_MERCHANTS)
+    df["event_timestamp"] = now - timedelta(hours=1)
+    df["merchant_transaction_count_7d"] = np.random.randint(10, 5000, NUM_MERCHANTS)
+    df["merchant_fraud_rate_30d"] = np.random.beta(1, 60, NUM_MERCHANTS).astype(
+        np.float32
+    )
+    df["created_timestamp"] = now
+
+    os.makedirs(os.path.dirname(MERCHANT_OUTPUT_FILE), exist_ok=True)
+    df.to_parquet(MERCHANT_OUTPUT_FILE, index=False)
+    print(f"Successfully generated {NUM_MERCHANTS} merchants to {MERCHANT_OUTPUT_FILE}")
+
+
+def generate_device_data():
+    """Generates one row of mock device features per device fingerprint."""
+    now = datetime.now()
+    df = pd.DataFrame()
+    df["device_id"] = [f"dev-{i:05d}" for i in range(NUM_DEVICES)]
+    df["event_timestamp"] = now - timedelta(hours=1)
+    # Most devices belong to one user; shared devices are a fraud signal
+    df["device_user_count_30d"] = np.random.geometric(0.7, NUM_DEVICES)
+    df["device_age_days"] = np.random.randint(0, 1000, NUM_DEVICES)
+    df["created_timestamp"] = now
+
+    os.makedirs(os.path.dirname(DEVICE_OUTPUT_FILE), exist_ok=True)
+    df.to_parquet(DEVICE_OUTPUT_FILE, index=False)
+    print(f"Successfully generated {NUM_DEVICES} devices to {DEVICE_OUTPUT_FILE}")
+
+
+def generate_live_transaction_data():
+    """Writes an empty batch source for live buckets; rows arrive via /ingest."""
+    schema = pa.schema(
+        [
+            ("user_id", pa.int64()),
+            ("event_timestamp", pa.timestamp("ns", tz="UTC")),
+            ("live_bucket_hour", pa.int64()),
+            ("live_counts", pa.list_(pa.int64())),
+            ("live_sums", pa.list_(pa.float64())),
+            ("live_sum_sqs", pa.list_(pa.float64())),
+            ("created_timestamp", pa.timestamp("ns", tz="UTC")),
+        ]
+    )
+
+    os.makedirs(os.path.dirname(LIVE_OUTPUT_FILE), exist_ok=True)
+    pq.write_table(schema.empty_table(), LIVE_OUTPUT_FILE)
+    print(f"Successfully created empty live transaction source {LIVE_OUTPUT_FILE}")
+
+
 if __name__ == "__main__":
     # Ensure all required libraries are installed before running (pandas, numpy, pyarrow)
     generate_transaction_data()
+    generate_merchant_data()
+    generate_device_data()
+    generate_live_transaction_data()
@@ -0,0 +1,98 @@
+# scripts/skew_report.py
+"""Training-serving skew report.
+
+Compares the features /predict actually served (the prediction log written
+by src/prediction_log.py) with the point-in-time offline values Feast would
+produce for training at the same moment. Run from the fraud_feature_store
+directory:
+    uv run scripts/skew_report.py
+"""
+
+import numpy as np
+import pandas as pd
+from feast import FeatureStore
+
+PREDICTION_LOG_DIR = "logs/predictions"
+FEAST_REPO_PATH = "feature_repo"
+FEATURE_VIEW = "user_transaction_features"
+STORED_FEATURES = [
+    "transaction_count_7d",
+    "avg_transaction_amount_7d",
+    "std_transaction_amount_7d",
+]
+# Relative tolerance for calling two values equal (features are float32)
+RELATIVE_TOLERANCE = 1e-4
+
+
+def load_served(log_dir: str = PREDICTION_LOG_DIR) -> pd.DataFrame:
+    """Logged predictions that were served from online features.
+
+    Degraded responses are excluded: by design they used cached or no
+    features, so they would show up as skew without telling us anything.
+    """
+    served = pd.read_parquet(log_dir)
+    return served[~served["degraded"]].reset_index(drop=True)
+
+
+def fetch_offline(store: FeatureStore, served: pd.DataFrame) -> pd.DataFrame:
+    """Point-in-time offline features for each logged request."""
+    entity_df = served[["request_id", "user_id", "served_at"]].rename(
+        columns={"served_at": "event_timestamp"}
+    )
+    return store.get_historical_features(
+        entity_df=entity_df,
+        features=[f"{FEATURE_VIEW}:{name}" for name in STORED_FEATURES],
+    ).to_df()
+
+
+def compare_features(
+    served: pd.DataFrame,
+    offline: pd.DataFrame,
+    features: list = STORED_FEATURES,
+    rtol: float = RELATIVE_TOLERANCE,
+) -> pd.DataFrame:
+    """Per-feature skew statistics, one row per feature.
+
+    ``served`` has ``feature__<name>`` columns, ``offline`` has ``<name>``
+    columns, joined on ``request_id``. ``mismatch_rate`` is the share of rows
+    where both sides have a value and they differ beyond ``rtol``.
+    """
+    joined = served.merge(
+        offline[["request_id", *features]], on="request_id", how="inner"
+    )
+    report = []
+    for name in features:
+        online = joined[f"feature__{name}"].astype(np.float64).to_numpy()
+        offline_values = joined[name].astype(np.float64).to_numpy()
+        online_missing = np.isnan(online)
+        offline_missing = np.isnan(offline_values)
+        both = ~online_missing & ~offline_missing
+        diff = np.abs(online[both] - offline_values[both])
+        mismatched = ~np.isclose(online[both], offline_values[both], rtol=rtol)
+        report.append(
+            {
+                "feature": name,
+                "rows": len(joined),
+                "compared": int(both.sum()),
+                "missing_online": int((online_missing & ~offline_missing).sum()),
+                "missing_offline": int((~online_missing & offline_missing).sum()),
+                "mismatch_rate": mismatched.mean() if both.any() else np.nan,
+                "mean_abs_diff": diff.mean() if both.any() else np.nan,
+                "max_abs_diff": diff.max() if both.any() else np.nan,
+            }
+        )
+    return pd.DataFrame(report)
+
+
+def run_skew_report():
+    served = load_served()
+    store = FeatureStore(repo_path=FEAST_REPO_PATH)
+    offline = fetch_offline(store, served)
+    report = compare_features(served, offline)
+
+    print(f"Compared {len(served)} served predictions against offline features")
+    print(report.to_string(index=False))
+
+
+if __name__ == "__main__":
+    run_skew_report()
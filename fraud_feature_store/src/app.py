@@ -1,20 +1,85 @@
 # src/app.py
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from feast import FeatureStore
+import asyncio
+import hmac
 import os
+import time
+import uuid
+from collections import deque
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+
+import pandas as pd
+from fastapi import FastAPI, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel, Field
+from feast import FeatureStore
+from feast.data_source import PushMode
+
+from .cache import LastKnownFeatureCache
+from .batching import BatchBuffer
+from .ingest import (
+    LIVE_FEATURES,
+    add_to_live_buckets,
+    combine_live_aggregates,
+    within_window,
+)
+from .log_throttle import throttled
+from .metrics import metrics
+from .models import (
+    ModelRegistry,
+    RuleBasedModel,
+    ShadowScorer,
+    load_model,
+    timed_score,
+)
+from .on_demand import REQUEST_FEATURES, request_features_for
+from .parquet_log import RollingParquetWriter
+from .prediction_log import PredictionLogger
+from .profiling import (
+    ProfilerBusy,
+    SlowRequestProfiler,
+    format_collapsed,
+    sample_stacks,
+)
+from .retrieval import EntityFeatureView, MultiEntityRetriever
+from .resilience import (
+    AdaptiveConcurrencyLimiter,
+    CircuitBreaker,
+    CircuitOpenError,
+    ConcurrencyLimitExceeded,
+)
 
 
 # --- 1. Define Schemas ---
 class UserIn(BaseModel):
     user_id: int
     transaction_amount: float  # Mock field for immediate checks if needed
+    # Optional entities, resolved against their own feature views in parallel
+    merchant_id: int | None = None
+    device_id: str | None = None
 
 
 class PredictionOut(BaseModel):
     is_fraud: bool
     confidence: float
     features_fetched: dict
+    degraded: bool = False
+    degraded_reason: str | None = None
+    model: str | None = None  # Model that produced the score, None for rules
+    request_id: str | None = None
+
+
+class TransactionEvent(BaseModel):
+    user_id: int
+    transaction_amount: float
+    event_timestamp: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc)
+    )
+
+
+class IngestOut(BaseModel):
+    accepted: int
+    pending: int
 
 
 # --- 2. Initialize FastAPI and Feature Store ---
@@ -34,61 +99,526 @@ except Exception as e:
     print(f"FATAL ERROR: Could not initialize Feast: {e}")
     fs = None
 
-app = FastAPI(title="Real-Time Fraud Prediction")
+# Latency budget for online feature retrieval. Callers can tighten or relax it
+# per request with the X-Request-Timeout-Ms header, up to MAX_FEATURE_TIMEOUT_MS.
+FEATURE_TIMEOUT_MS = float(os.getenv("FEATURE_TIMEOUT_MS", "100"))
+MAX_FEATURE_TIMEOUT_MS = float(os.getenv("MAX_FEATURE_TIMEOUT_MS", "1000"))
+
+FRAUD_AMOUNT_THRESHOLD = 1000.0
+# Transactions this many deviations above the user's 7-day mean are flagged
+FRAUD_ZSCORE_THRESHOLD = float(os.getenv("FRAUD_ZSCORE_THRESHOLD", "4"))
+
+# Last features successfully served per user, used when the store is degraded
+feature_cache = LastKnownFeatureCache(
+    max_entries=int(os.getenv("FEATURE_CACHE_MAX_ENTRIES", "10000")),
+    max_age_s=float(os.getenv("FEATURE_CACHE_MAX_AGE_S", "3600")),
+)
+
+
+# Shed load from a struggling online store instead of piling more calls on it.
+# Every feature view gets its own breaker and limiter (labelled with the view
+# name), so an outage of an optional view cannot shed the required one.
+def make_breaker(name: str) -> CircuitBreaker:
+    return CircuitBreaker(
+        name=name,
+        window_size=int(os.getenv("BREAKER_WINDOW_SIZE", "20")),
+        min_calls=int(os.getenv("BREAKER_MIN_CALLS", "10")),
+        error_rate_threshold=float(os.getenv("BREAKER_ERROR_RATE", "0.5")),
+        # Below the budget: calls slower than the budget already time out and
+        # count as failures, so "slow" must mean slow yet still in time
+        slow_call_s=float(
+            os.getenv("BREAKER_SLOW_CALL_MS", str(FEATURE_TIMEOUT_MS / 2))
+        )
+        / 1000,
+        slow_call_rate_threshold=float(os.getenv("BREAKER_SLOW_CALL_RATE", "0.5")),
+        open_duration_s=float(os.getenv("BREAKER_OPEN_S", "5")),
+        half_open_max_calls=int(os.getenv("BREAKER_HALF_OPEN_CALLS", "3")),
+    )
+
+
+def make_limiter(name: str) -> AdaptiveConcurrencyLimiter:
+    return AdaptiveConcurrencyLimiter(
+        name=name,
+        initial_limit=int(os.getenv("LIMITER_INITIAL", "20")),
+        min_limit=int(os.getenv("LIMITER_MIN", "1")),
+        max_limit=int(os.getenv("LIMITER_MAX", "200")),
+        latency_threshold_s=float(os.getenv("LIMITER_LATENCY_MS", "50")) / 1000,
+    )
+
+
+# Feature views served per entity. Each named entity costs one concurrent
+# lookup per view; only the user view is required to score
+USER_FEATURE_VIEW = EntityFeatureView(
+    "user_id",
+    "user_transaction_features",
+    ["transaction_count_7d", "avg_transaction_amount_7d", "std_transaction_amount_7d"],
+    required=True,
+    # Event times tell which live buckets the batch aggregates already cover
+    include_event_timestamps=True,
+    breaker=make_breaker("user_transaction_features"),
+    limiter=make_limiter("user_transaction_features"),
+)
+# Transactions ingested since the batch aggregates, folded into them at read
+# time (see src/ingest.py)
+USER_LIVE_FEATURE_VIEW = EntityFeatureView(
+    "user_id",
+    "user_live_transaction_features",
+    LIVE_FEATURES,
+    breaker=make_breaker("user_live_transaction_features"),
+    limiter=make_limiter("user_live_transaction_features"),
+)
+MERCHANT_FEATURE_VIEW = EntityFeatureView(
+    "merchant_id",
+    "merchant_transaction_features",
+    ["merchant_transaction_count_7d", "merchant_fraud_rate_30d"],
+    breaker=make_breaker("merchant_transaction_features"),
+    limiter=make_limiter("merchant_transaction_features"),
+)
+DEVICE_FEATURE_VIEW = EntityFeatureView(
+    "device_id",
+    "device_features",
+    ["device_user_count_30d", "device_age_days"],
+    breaker=make_breaker("device_features"),
+    limiter=make_limiter("device_features"),
+)
+FEATURE_VIEWS = [
+    USER_FEATURE_VIEW,
+    USER_LIVE_FEATURE_VIEW,
+    MERCHANT_FEATURE_VIEW,
+    DEVICE_FEATURE_VIEW,
+]
+
+# Guards of the required user view
+store_breaker = USER_FEATURE_VIEW.breaker
+store_limiter = USER_FEATURE_VIEW.limiter
+
+# Primary model answers the request; shadow models (SHADOW_MODELS, comma
+# separated "module:attribute" paths) score the same features off the
+# response path and are logged for offline comparison
+model_registry = ModelRegistry(
+    RuleBasedModel(
+        amount_threshold=FRAUD_AMOUNT_THRESHOLD,
+        zscore_threshold=FRAUD_ZSCORE_THRESHOLD,
+    )
+)
+for model_path in filter(None, os.getenv("SHADOW_MODELS", "").split(",")):
+    model_registry.register_shadow(load_model(model_path.strip()))
+
+shadow_log_writer = RollingParquetWriter(
+    os.getenv("SHADOW_LOG_DIR", "logs/shadow_scores"),
+    prefix="shadow_scores",
+    max_bytes=int(os.getenv("SHADOW_LOG_MAX_BYTES", str(1 << 30))),
+    max_age_s=float(os.getenv("SHADOW_LOG_MAX_AGE_S", str(7 * 24 * 3600))),
+)
+shadow_log = BatchBuffer(
+    "shadow_log",
+    shadow_log_writer.write,
+    flush_size=int(os.getenv("SHADOW_LOG_FLUSH_SIZE", "1000")),
+    flush_interval_s=float(os.getenv("SHADOW_LOG_FLUSH_INTERVAL_S", "10")),
+)
+shadow_scorer = ShadowScorer(
+    model_registry,
+    shadow_log,
+    max_workers=int(os.getenv("SHADOW_MAX_WORKERS", "2")),
+    max_pending=int(os.getenv("SHADOW_MAX_PENDING", "1000")),
+)
+
+# Record of what /predict served (features, score, model, latency) for
+# training-serving skew analysis, see scripts/skew_report.py
+PREDICTION_LOG_ENABLED = os.getenv("PREDICTION_LOG_ENABLED", "true").lower() == "true"
+prediction_logger = None
+if PREDICTION_LOG_ENABLED:
+    prediction_logger = PredictionLogger(
+        RollingParquetWriter(
+            os.getenv("PREDICTION_LOG_DIR", "logs/predictions"),
+            prefix="predictions",
+            compression="zstd",
+            # Oldest files are deleted beyond these, so disk use stays bounded
+            max_files=int(os.getenv("PREDICTION_LOG_MAX_FILES", "10000")),
+            max_bytes=int(os.getenv("PREDICTION_LOG_MAX_BYTES", str(1 << 30))),
+            max_age_s=float(os.getenv("PREDICTION_LOG_MAX_AGE_S", str(7 * 24 * 3600))),
+        ),
+        # Live buckets are already folded into the user features when served
+        feature_names=[
+            name
+            for view in FEATURE_VIEWS
+            if view is not USER_LIVE_FEATURE_VIEW
+            for name in view.features
+        ]
+        + REQUEST_FEATURES,
+        capacity=int(os.getenv("PREDICTION_LOG_CAPACITY", "65536")),
+        flush_interval_s=float(os.getenv("PREDICTION_LOG_FLUSH_INTERVAL_S", "5")),
+    )
+
+
+# --- 3. Write-through Ingestion & App Lifecycle ---
+PUSH_SOURCE_NAME = "user_live_transactions_push"
+# Also append pushed live buckets to the offline store
+INGEST_TO_OFFLINE = os.getenv("INGEST_TO_OFFLINE", "false").lower() == "true"
+
+
+def push_transactions(events: list):
+    """Add a batch of raw events to the users' live buckets and push them.
+
+    Runs on the ingestion flusher thread, never on the request path. Each
+    user's bucket row is read, updated and written back, so only one
+    flusher (one worker of one replica) may ingest a given user.
+    """
+    events_df = pd.DataFrame(events)
+    events_df["event_timestamp"] = pd.to_datetime(
+        events_df["event_timestamp"], utc=True
+    )
+    now = pd.Timestamp.now(tz="UTC")
+    events_df = within_window(events_df, now)
+    expired = len(events) - len(events_df)
+    if expired:
+        print(f"Dropped {expired} events older than the aggregation window")
+        metrics.inc("ingest_events_expired_total", expired)
+    if events_df.empty:
+        return
+    user_ids = events_df["user_id"].unique().tolist()
+
+    current = fs.get_online_features(
+        features=USER_LIVE_FEATURE_VIEW.feature_refs,
+        entity_rows=[{"user_id": user_id} for user_id in user_ids],
+    ).to_dict()
+    updated = add_to_live_buckets(current, events_df, now)
+    if updated.empty:
+        return
+
+    fs.push(
+        PUSH_SOURCE_NAME,
+        updated,
+        to=PushMode.ONLINE_AND_OFFLINE if INGEST_TO_OFFLINE else PushMode.ONLINE,
+    )
+    # Fallback features for these users are now older than the store's
+    for user_id in user_ids:
+        feature_cache.invalidate(user_id)
+
+
+ingest_buffer = BatchBuffer(
+    "ingest",
+    push_transactions,
+    flush_size=int(os.getenv("INGEST_FLUSH_SIZE", "500")),
+    flush_interval_s=float(os.getenv("INGEST_FLUSH_INTERVAL_S", "1.0")),
+    max_pending=int(os.getenv("INGEST_MAX_PENDING", "50000")),
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    ingest_buffer.start()
+    shadow_log.start()
+    if prediction_logger is not None:
+        prediction_logger.start()
+    yield
+    # Flush buffered events, shadow scores and predictions before exiting
+    ingest_buffer.stop()
+    shadow_scorer.shutdown()
+    shadow_log.stop()
+    if prediction_logger is not None:
+        prediction_logger.stop()
+
+
+app = FastAPI(title="Real-Time Fraud Prediction", lifespan=lifespan)
+
+# Opt-in profiling: admin endpoints answer 404 unless ENABLE_PROFILING=true,
+# and the slow request profiler is only installed when a threshold is set
+PROFILING_ENABLED = os.getenv("ENABLE_PROFILING", "false").lower() == "true"
+# Admin endpoints share the public port, so they also require this token in
+# the X-Admin-Token header; with no token configured they refuse every call
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+PROFILE_SLOW_REQUEST_MS = os.getenv("PROFILE_SLOW_REQUEST_MS")
+MAX_PROFILE_SECONDS = 60.0
+slow_request_profiles = deque(maxlen=int(os.getenv("PROFILE_MAX_KEPT", "20")))
+if PROFILE_SLOW_REQUEST_MS:
+    app.add_middleware(
+        SlowRequestProfiler,
+        profiles=slow_request_profiles,
+        threshold_ms=float(PROFILE_SLOW_REQUEST_MS),
+        sample_rate=float(os.getenv("PROFILE_SAMPLE_RATE", "0.01")),
+    )
+
+
+# --- 4. Scoring ---
+def score_amount_only(transaction_amount: float) -> tuple[bool, float]:
+    """Fallback rule when no features are available: judge the amount alone."""
+    is_fraud = transaction_amount > FRAUD_AMOUNT_THRESHOLD
+    # Lower confidence than the feature-based score, it sees far less context
+    return is_fraud, 0.7 if is_fraud else 0.3
+
 
+async def fetch_online_features(
+    view: EntityFeatureView, entity_rows: list, timeout_s: float
+) -> dict:
+    """Retrieve a view's online features behind its breaker and limiter.
 
-# --- 3. Prediction Endpoint ---
+    The Feast call is blocking, so it runs in a worker thread. On timeout the
+    thread is left to finish in the background; the request does not wait,
+    but its limiter slot stays taken until the store actually answers.
+    """
+    breaker, limiter = view.breaker, view.limiter
+    if not limiter.try_acquire():
+        raise ConcurrencyLimitExceeded()
+    if not breaker.allow_request():
+        limiter.cancel()
+        raise CircuitOpenError()
+
+    def call_store():
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = fs.get_online_features(
+                features=view.feature_refs, entity_rows=entity_rows
+            ).to_dict(include_event_timestamps=view.include_event_timestamps)
+            failed = False
+            return result
+        finally:
+            limiter.release(time.perf_counter() - start, failed=failed)
+
+    start = time.perf_counter()
+    try:
+        result = await asyncio.wait_for(asyncio.to_thread(call_store), timeout_s)
+    except Exception:
+        breaker.record_failure()
+        raise
+    breaker.record_success(time.perf_counter() - start)
+    return result
+
+
+retriever = MultiEntityRetriever(fetch_online_features, FEATURE_VIEWS)
+
+
+def degraded_prediction(
+    user_data: UserIn, reason: str, request_id: str
+) -> PredictionOut:
+    """Score without the online store: last-known features, else amount rules.
+
+    Shadow models are skipped, their scores on fallback inputs would only
+    blur the comparison with the primary.
+    """
+    cached = feature_cache.get(user_data.user_id)
+    model = None
+    if cached is not None:
+        source = "cache"
+        features = {
+            **cached,
+            **request_features_for(user_data.transaction_amount, cached),
+        }
+        model = model_registry.primary
+        is_fraud, confidence, _ = timed_score(model, features)
+    else:
+        source = "rules"
+        is_fraud, confidence = score_amount_only(user_data.transaction_amount)
+        features = {}
+
+    metrics.inc("predict_degraded_total", reason=reason, source=source)
+    return PredictionOut(
+        is_fraud=is_fraud,
+        confidence=confidence,
+        features_fetched=features,
+        degraded=True,
+        degraded_reason=f"{reason}:{source}",
+        model=model.model_id if model else None,
+        request_id=request_id,
+    )
+
+
+# --- 5. Prediction Endpoint ---
 @app.post("/predict", response_model=PredictionOut)
-async def predict(user_data: UserIn):
+async def predict(
+    user_data: UserIn,
+    request_timeout_ms: float | None = Header(
+        default=None, alias="X-Request-Timeout-Ms", gt=0
+    ),
+):
     if not fs:
         raise HTTPException(status_code=503, detail="Feature Store is unavailable.")
 
-    # 1. Define the entity key for the current request
-    entity_rows = [
-        {"user_id": user_data.user_id}
+    metrics.inc("predict_requests_total")
+    start = time.perf_counter()
+    request_id = uuid.uuid4().hex
+    # An oversized header is clamped rather than trusted with an unbounded wait
+    timeout_ms = min(request_timeout_ms or FEATURE_TIMEOUT_MS, MAX_FEATURE_TIMEOUT_MS)
+    response = await score_request(user_data, timeout_ms, request_id)
+
+    if prediction_logger is not None:
+        # Only a ring buffer append here; the flusher thread does the I/O
+        prediction_logger.log(
+            {
+                "request_id": request_id,
+                "served_at": datetime.now(timezone.utc),
+                "user_id": user_data.user_id,
+                "transaction_amount": user_data.transaction_amount,
+                "is_fraud": response.is_fraud,
+                "confidence": response.confidence,
+                "model": response.model,
+                "degraded": response.degraded,
+                "degraded_reason": response.degraded_reason,
+                "latency_ms": (time.perf_counter() - start) * 1000,
+                "features": response.features_fetched,
+            }
+        )
+    return response
+
+
+async def score_request(
+    user_data: UserIn, timeout_ms: float, request_id: str
+) -> PredictionOut:
+    """Fetch features and score, degrading instead of failing on store trouble."""
+    # 1. Define the entity keys for the current request
+    entities = {
+        "user_id": user_data.user_id,
+        "merchant_id": user_data.merchant_id,
+        "device_id": user_data.device_id,
         # Note: You don't need the timestamp here, Feast assumes "now" for online retrieval
-    ]
+    }
 
-    # 2. Retrieve the latest online features
+    # 2. Retrieve the latest online features of every entity, concurrently,
+    # within the latency budget
     try:
-        online_features = fs.get_online_features(
-            features=[
-                "user_transaction_features:transaction_count_7d",
-                "user_transaction_features:avg_transaction_amount_7d",
-            ],
-            entity_rows=entity_rows,
-        ).to_dict()
+        online_features = await retriever.retrieve(entities, timeout_ms / 1000)
+    except CircuitOpenError:
+        return degraded_prediction(user_data, "circuit_open", request_id)
+    except ConcurrencyLimitExceeded:
+        return degraded_prediction(user_data, "overload", request_id)
+    except TimeoutError:
+        # Counted in predict_degraded_total; the log only samples it
+        throttled.print(
+            "feature_timeout",
+            f"Online feature retrieval exceeded {timeout_ms:.0f}ms "
+            f"for user {user_data.user_id}, degrading",
+        )
+        return degraded_prediction(user_data, "timeout", request_id)
     except Exception as e:
         # Crucial Error Handling: If Redis (online store) is down, you must handle it!
-        raise HTTPException(
-            status_code=500, detail=f"Online Feature Store retrieval failed: {e}"
+        throttled.print(
+            "feature_store_error",
+            f"Online Feature Store retrieval failed: {e}, degrading",
         )
+        return degraded_prediction(user_data, "store_error", request_id)
+    online_features = combine_live_aggregates(online_features, time.time())
 
     # Check if user exists (has valid features)
     avg_amount = online_features["avg_transaction_amount_7d"][0]
     transaction_count = online_features["transaction_count_7d"][0]
-    
+
     # Handle case where user doesn't exist in feature store
     if avg_amount is None or transaction_count is None:
         raise HTTPException(
-            status_code=404, 
-            detail=f"User {user_data.user_id} not found in feature store. No historical transaction data available."
+            status_code=404,
+            detail=f"User {user_data.user_id} not found in feature store. No historical transaction data available.",
         )
 
-    # 3. MOCK MODEL SCORING
-    # In a real project, you would load your trained model here and score it.
-    # For now, we'll just check if the average transaction amount is high.
-    is_fraud = avg_amount > 1000  # Simple mock fraud logic
+    # Only user features are served from the cache when degraded
+    feature_cache.put(
+        user_data.user_id,
+        {
+            name: online_features[name]
+            for name in ["user_id", *USER_FEATURE_VIEW.features]
+        },
+    )
+
+    # 3. Add request-time features and score the transaction
+    features = {
+        **online_features,
+        **request_features_for(user_data.transaction_amount, online_features),
+    }
+    primary = model_registry.primary
+    is_fraud, confidence, _ = timed_score(primary, features)
 
-    # 4. Return results
+    # 4. Hand the same features to shadow models, off the response path
+    shadow_scorer.submit(
+        {
+            "request_id": request_id,
+            "user_id": user_data.user_id,
+            "transaction_amount": user_data.transaction_amount,
+            "scored_at": time.time(),
+        },
+        features,
+        (is_fraud, confidence),
+    )
+
+    # 5. Return results
     return PredictionOut(
         is_fraud=is_fraud,
-        confidence=0.9 if is_fraud else 0.5,
-        features_fetched=online_features,
+        confidence=confidence,
+        features_fetched=features,
+        model=primary.model_id,
+        request_id=request_id,
     )
 
 
+# --- 6. Ingestion Endpoints ---
+def enqueue_events(events: list[TransactionEvent]) -> IngestOut:
+    if not fs:
+        raise HTTPException(status_code=503, detail="Feature Store is unavailable.")
+    if not ingest_buffer.add([event.model_dump() for event in events]):
+        raise HTTPException(
+            status_code=503, detail="Ingestion buffer is full, retry later."
+        )
+    return IngestOut(accepted=len(events), pending=ingest_buffer.pending)
+
+
+@app.post("/ingest", response_model=IngestOut, status_code=202)
+def ingest(event: TransactionEvent):
+    """Buffer one live transaction for the next write-through flush."""
+    return enqueue_events([event])
+
+
+@app.post("/ingest/bulk", response_model=IngestOut, status_code=202)
+def ingest_bulk(events: list[TransactionEvent]):
+    """Buffer a batch of live transactions for the next write-through flush."""
+    return enqueue_events(events)
+
+
+# --- 7. Admin Endpoints ---
+def require_profiling(admin_token: str | None):
+    if not PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Profiling is disabled.")
+    if not ADMIN_TOKEN or not hmac.compare_digest(
+        (admin_token or "").encode(), ADMIN_TOKEN.encode()
+    ):
+        raise HTTPException(status_code=403, detail="Invalid admin token.")
+
+
+@app.get("/admin/profile", response_class=PlainTextResponse)
+async def profile(
+    seconds: float = Query(default=10.0, gt=0, le=MAX_PROFILE_SECONDS),
+    interval_ms: float = Query(default=5.0, ge=1, le=1000),
+    admin_token: str | None = Header(default=None, alias="X-Admin-Token"),
+):
+    """Sample all threads for N seconds; returns collapsed stacks.
+
+    Pipe the output into flamegraph.pl or load it in speedscope.
+    """
+    require_profiling(admin_token)
+    try:
+        # Sample from a worker thread so the event loop keeps serving traffic
+        stacks = await asyncio.to_thread(sample_stacks, seconds, interval_ms / 1000)
+    except ProfilerBusy:
+        raise HTTPException(
+            status_code=409, detail="A profiling session is already running."
+        )
+    return format_collapsed(stacks)
+
+
+@app.get("/admin/profile/slow")
+def slow_profiles(
+    admin_token: str | None = Header(default=None, alias="X-Admin-Token"),
+):
+    """cProfile output of recent sampled requests over PROFILE_SLOW_REQUEST_MS."""
+    require_profiling(admin_token)
+    return list(slow_request_profiles)
+
+
 @app.get("/health")
 def health_check():
     """Liveness probe. Checks if the Feature Store connection is active."""
     return {"status": "ok", "feast_ready": fs is not None}
+
+
+@app.get("/metrics")
+def get_metrics():
+    """Operational counters and gauges (degradation, store guards, ingestion)."""
+    return metrics.snapshot()
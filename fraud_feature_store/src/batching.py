@@ -0,0 +1,102 @@
+# src/batching.py
+"""Background batching of events bound for slow sinks (stores, files).
+
+Events are buffered in memory and flushed in batches by a background thread,
+either when ``flush_size`` events are pending or every ``flush_interval_s``.
+"""
+
+import threading
+
+from .metrics import metrics
+
+
+class BatchBuffer:
+    """Bounded in-memory buffer of events with size- and time-based flushing.
+
+    ``flush_fn`` receives a list of events. A failed flush drops its batch
+    (counted in ``<name>_events_dropped_total``) rather than retrying forever
+    against a broken sink. Metrics are prefixed with ``name``; they are plain
+    counters, throughput is left to the metrics backend (e.g. ``rate()``).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        flush_fn,
+        flush_size: int = 500,
+        flush_interval_s: float = 1.0,
+        max_pending: int = 50_000,
+    ):
+        self.name = name
+        self.flush_fn = flush_fn
+        self.flush_size = flush_size
+        self.flush_interval_s = flush_interval_s
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        # Serializes flushes so batches reach the sink in arrival order
+        self._flush_lock = threading.Lock()
+        self._pending = []
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def add(self, events: list) -> bool:
+        """Queue events; returns False (nothing queued) if the buffer is full."""
+        with self._lock:
+            if len(self._pending) + len(events) > self.max_pending:
+                metrics.inc(f"{self.name}_events_rejected_total", len(events))
+                return False
+            self._pending.extend(events)
+            pending = len(self._pending)
+        metrics.inc(f"{self.name}_events_received_total", len(events))
+        metrics.set_gauge(f"{self.name}_events_pending", pending)
+        if pending >= self.flush_size:
+            self._wake.set()
+        return True
+
+    def flush(self) -> int:
+        """Flush everything pending now; returns the number of events flushed."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            metrics.set_gauge(f"{self.name}_events_pending", len(self._pending))
+            if not batch:
+                return 0
+            try:
+                self.flush_fn(batch)
+            except Exception as e:
+                print(f"{self.name} flush of {len(batch)} events failed: {e}")
+                metrics.inc(f"{self.name}_flush_failures_total")
+                metrics.inc(f"{self.name}_events_dropped_total", len(batch))
+                return 0
+            metrics.inc(f"{self.name}_flushes_total")
+            metrics.inc(f"{self.name}_events_flushed_total", len(batch))
+            return len(batch)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=f"{self.name}-flusher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background flusher and flush whatever is still pending."""
+        if self._thread is not None:
+            self._stopping.set()
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wake.wait(self.flush_interval_s)
+            self._wake.clear()
+            self.flush()
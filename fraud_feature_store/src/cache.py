@@ -0,0 +1,50 @@
+# src/cache.py
+"""Last-known feature cache used as a fallback when the online store is slow."""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class LastKnownFeatureCache:
+    """Bounded LRU of the most recent features successfully served per entity.
+
+    Entries are only a fallback for degraded scoring, so stale values are
+    acceptable up to ``max_age_s``; anything older is treated as a miss.
+    """
+
+    def __init__(self, max_entries: int = 10_000, max_age_s: float = 3600.0):
+        self.max_entries = max_entries
+        self.max_age_s = max_age_s
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def put(self, key, features: dict):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), features)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, features = entry
+            if time.monotonic() - stored_at > self.max_age_s:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return features
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
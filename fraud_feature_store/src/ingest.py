@@ -0,0 +1,162 @@
+# src/ingest.py
+"""Write-through ingestion of live transaction events.
+
+Events are buffered in a ``BatchBuffer`` and flushed in batches. Live
+transactions are kept apart from the batch ``*_7d`` aggregates: each flush
+adds them to per-user hourly buckets (``add_to_live_buckets``), pushed to
+their own feature view, and ``combine_live_aggregates`` folds the buckets
+that are still inside the window, and newer than the batch row, into the
+batch aggregates at read time. Nothing pushed ever overwrites materialized
+batch rows, and live transactions age out by themselves.
+
+Each flush reads, updates and pushes a user's bucket row, so there must be a
+single writer per user: concurrent flushes from several workers or replicas
+for the same user lose updates.
+"""
+
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+# Span of the stored ``*_7d`` aggregates
+AGGREGATION_WINDOW = timedelta(days=7)
+# Live buckets are hourly; bucket ``i`` of a row covers the hour
+# ``live_bucket_hour - i`` (hours since the epoch)
+BUCKET = timedelta(hours=1)
+WINDOW_BUCKETS = int(AGGREGATION_WINDOW / BUCKET)
+LIVE_FEATURES = ["live_bucket_hour", "live_counts", "live_sums", "live_sum_sqs"]
+
+
+def within_window(
+    events: pd.DataFrame, now: pd.Timestamp, window: timedelta = AGGREGATION_WINDOW
+) -> pd.DataFrame:
+    """Events that belong in the rolling aggregates as of ``now``.
+
+    Client-supplied times are not trusted: future times (clock skew) are
+    clamped to ``now``, and events older than ``window`` are dropped.
+    """
+    events = events.assign(event_timestamp=events["event_timestamp"].clip(upper=now))
+    return events[events["event_timestamp"] > now - window]
+
+
+def bucket_hour(seconds: float) -> int:
+    """Hourly bucket (hours since the epoch) of a Unix timestamp."""
+    return int(seconds // BUCKET.total_seconds())
+
+
+def _aligned(values, stored_hour, anchor_hour: int) -> np.ndarray:
+    """A stored bucket array re-indexed so bucket 0 is ``anchor_hour``."""
+    aligned = np.zeros(WINDOW_BUCKETS)
+    if values is None or stored_hour is None:
+        return aligned
+    shift = anchor_hour - stored_hour
+    kept = np.asarray(values, dtype=np.float64)[: max(WINDOW_BUCKETS - shift, 0)]
+    aligned[shift : shift + len(kept)] = kept
+    return aligned
+
+
+def add_to_live_buckets(
+    current: dict, events: pd.DataFrame, now: pd.Timestamp
+) -> pd.DataFrame:
+    """Add raw transaction events to the users' live hourly buckets.
+
+    ``current`` is a Feast ``to_dict()`` result of ``LIVE_FEATURES`` for the
+    affected users (``None`` for users without live data); ``events`` has
+    ``user_id``, ``transaction_amount`` and ``event_timestamp`` columns, all
+    within the window. Buckets that fell out of the window are dropped and
+    trailing empty buckets are trimmed; users with nothing left to add get no
+    row. Rows are stamped with ``now`` (the flush time), so the online store
+    never skips them as older than the row they replace.
+    """
+    now_hour = bucket_hour(now.timestamp())
+    event_hours = (
+        (events["event_timestamp"] - pd.Timestamp(0, tz="UTC")) // BUCKET
+    ).to_numpy()
+    stored = {user_id: i for i, user_id in enumerate(current["user_id"])}
+
+    rows = []
+    for user_id, index in events.groupby("user_id").indices.items():
+        i = stored.get(user_id)
+        stored_hour = current["live_bucket_hour"][i] if i is not None else None
+        anchor = max(now_hour, stored_hour or now_hour)
+        buckets = {
+            name: _aligned(
+                current[name][i] if i is not None else None, stored_hour, anchor
+            )
+            for name in ["live_counts", "live_sums", "live_sum_sqs"]
+        }
+        ages = anchor - event_hours[index]
+        amounts = events["transaction_amount"].to_numpy(dtype=np.float64)[index]
+        # The window is kept at hourly granularity; an event in the oldest,
+        # partial hour would expire within the hour anyway
+        in_window = ages < WINDOW_BUCKETS
+        ages, amounts = ages[in_window], amounts[in_window]
+        if not len(ages):
+            continue
+        np.add.at(buckets["live_counts"], ages, 1)
+        np.add.at(buckets["live_sums"], ages, amounts)
+        np.add.at(buckets["live_sum_sqs"], ages, np.square(amounts))
+
+        used = np.flatnonzero(buckets["live_counts"]).max() + 1
+        rows.append(
+            {
+                "user_id": user_id,
+                "event_timestamp": now,
+                "created_timestamp": now,
+                "live_bucket_hour": anchor,
+                "live_counts": buckets["live_counts"][:used].astype(np.int64).tolist(),
+                "live_sums": buckets["live_sums"][:used].tolist(),
+                "live_sum_sqs": buckets["live_sum_sqs"][:used].tolist(),
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def combine_live_aggregates(features: dict, now_s: float) -> dict:
+    """Fold live buckets into the batch aggregates of a single-user result.
+
+    ``features`` is a joined Feast ``to_dict()`` result holding the batch
+    ``*_7d`` features with their ``__ts`` event timestamps, plus
+    ``LIVE_FEATURES``. Only buckets inside the window and starting at or
+    after the batch row's event time are added, since earlier transactions
+    are already part of the batch aggregates. Counts, means and standard
+    deviations are combined with the parallel-variance formula. Live and
+    ``__ts`` columns are removed from the result.
+    """
+    combined = {
+        name: values
+        for name, values in features.items()
+        if name not in LIVE_FEATURES and not name.endswith("__ts")
+    }
+    live_hour = features.get("live_bucket_hour", [None])[0]
+    counts = features.get("live_counts", [None])[0]
+    if live_hour is None or not counts:
+        return combined
+
+    hours = live_hour - np.arange(len(counts))
+    batch_ts = features.get("transaction_count_7d__ts", [0])[0] or 0
+    keep = (bucket_hour(now_s) - hours < WINDOW_BUCKETS) & (
+        hours * BUCKET.total_seconds() >= batch_ts
+    )
+    count_b = float(np.asarray(counts, dtype=np.float64)[keep].sum())
+    if count_b == 0:
+        return combined
+    sum_b = float(np.asarray(features["live_sums"][0])[keep].sum())
+    sum_sq_b = float(np.asarray(features["live_sum_sqs"][0])[keep].sum())
+
+    count_a = max(combined["transaction_count_7d"][0] or 0, 0)
+    mean_a = combined["avg_transaction_amount_7d"][0] or 0.0
+    m2_a = (combined.get("std_transaction_amount_7d", [None])[0] or 0.0) ** 2 * count_a
+
+    mean_b = sum_b / count_b
+    m2_b = sum_sq_b - count_b * mean_b**2
+    count = count_a + count_b
+    delta = mean_b - mean_a
+    mean = mean_a + delta * count_b / count
+    m2 = m2_a + m2_b + delta**2 * count_a * count_b / count
+
+    combined["transaction_count_7d"] = [int(count)]
+    combined["avg_transaction_amount_7d"] = [mean]
+    combined["std_transaction_amount_7d"] = [float(np.sqrt(max(m2, 0.0) / count))]
+    return combined
@@ -0,0 +1,42 @@
+# src/log_throttle.py
+"""Rate-limited printing for messages that can repeat once per request.
+
+During an outage every request hits the same failure; printing each one
+would flood stdout from the event loop exactly when the service is under
+pressure. Counters already record every occurrence, so the log only needs
+a periodic sample.
+"""
+
+import threading
+import time
+
+
+class ThrottledPrinter:
+    """Prints at most one message per ``key`` every ``interval_s`` seconds.
+
+    The next message printed for a key reports how many were suppressed
+    since the previous one.
+    """
+
+    def __init__(self, interval_s: float = 10.0, clock=time.monotonic):
+        self.interval_s = interval_s
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last = {}  # key -> (last printed at, suppressed since)
+
+    def print(self, key: str, message: str) -> bool:
+        now = self._clock()
+        with self._lock:
+            printed_at, suppressed = self._last.get(key, (None, 0))
+            if printed_at is not None and now - printed_at < self.interval_s:
+                self._last[key] = (printed_at, suppressed + 1)
+                return False
+            self._last[key] = (now, 0)
+        if suppressed:
+            message = f"{message} ({suppressed} similar suppressed)"
+        print(message)
+        return True
+
+
+# Shared by the request path: one line per failure kind per interval
+throttled = ThrottledPrinter()
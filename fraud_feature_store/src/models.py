@@ -0,0 +1,161 @@
+# src/models.py
+"""Fraud models and shadow scoring.
+
+Every model scores the same feature dict (Feast ``to_dict()`` format plus
+request-time features), so one ``get_online_features`` call serves the
+primary model and all shadow models. Shadow models run on a bounded worker
+pool after the response is computed, and their scores are written in
+batches for offline comparison against the primary.
+"""
+
+import importlib
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+
+from .log_throttle import throttled
+from .metrics import metrics
+
+
+class FraudModel(ABC):
+    """Interface for models: ``score(features) -> (is_fraud, confidence)``."""
+
+    name = "model"
+    version = "0"
+
+    @property
+    def model_id(self) -> str:
+        return f"{self.name}:{self.version}"
+
+    @abstractmethod
+    def score(self, features: dict) -> tuple[bool, float]: ...
+
+
+class RuleBasedModel(FraudModel):
+    """Threshold rules over stored and request-time features."""
+
+    # MOCK MODEL SCORING
+    # In a real project, you would load your trained model here and score it.
+    # For now, we flag users with a high average transaction amount, and
+    # transactions far above the user's usual amount (request-time z-score).
+
+    def __init__(
+        self,
+        name: str = "rules",
+        version: str = "v1",
+        amount_threshold: float = 1000.0,
+        zscore_threshold: float = 4.0,
+    ):
+        self.name = name
+        self.version = version
+        self.amount_threshold = amount_threshold
+        self.zscore_threshold = zscore_threshold
+
+    def score(self, features: dict) -> tuple[bool, float]:
+        zscore = features["amount_zscore_7d"][0]
+        is_fraud = features["avg_transaction_amount_7d"][0] > self.amount_threshold or (
+            zscore is not None and zscore > self.zscore_threshold
+        )
+        return is_fraud, 0.9 if is_fraud else 0.5
+
+
+def load_model(path: str) -> FraudModel:
+    """Import a model instance from ``"package.module:attribute"``."""
+    module_name, _, attribute = path.partition(":")
+    model = getattr(importlib.import_module(module_name), attribute)
+    if not isinstance(model, FraudModel):
+        raise TypeError(f"{path} is a {type(model).__name__}, not a FraudModel.")
+    return model
+
+
+def timed_score(model: FraudModel, features: dict) -> tuple[bool, float, float]:
+    """Score and record the model's latency; returns (is_fraud, confidence, s)."""
+    start = time.perf_counter()
+    is_fraud, confidence = model.score(features)
+    elapsed = time.perf_counter() - start
+    metrics.observe("model_score_seconds", elapsed, model=model.model_id)
+    return is_fraud, confidence, elapsed
+
+
+class ModelRegistry:
+    """One primary model, whose score is returned, plus any shadow models."""
+
+    def __init__(self, primary: FraudModel):
+        self.primary = primary
+        self.shadows = []
+
+    def register_shadow(self, model: FraudModel):
+        if not isinstance(model, FraudModel):
+            raise TypeError(f"Shadow model must be a FraudModel, got {model!r}.")
+        if any(m.model_id == model.model_id for m in [self.primary, *self.shadows]):
+            raise ValueError(f"Model {model.model_id} is already registered.")
+        self.shadows.append(model)
+
+
+class ShadowScorer:
+    """Runs shadow models off the response path on a bounded worker pool.
+
+    At most ``max_pending`` requests wait for or run shadow scoring; beyond
+    that, shadow scoring is skipped (``shadow_dropped_total``) rather than
+    queueing without bound. One row per shadow model goes to ``log``, any
+    object with an ``add(rows) -> bool`` method such as a ``BatchBuffer``.
+    """
+
+    def __init__(
+        self,
+        registry: ModelRegistry,
+        log,
+        max_workers: int = 2,
+        max_pending: int = 1000,
+    ):
+        self.registry = registry
+        self.log = log
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="shadow-scorer"
+        )
+
+    def submit(self, context: dict, features: dict, primary: tuple) -> bool:
+        """Queue shadow scoring; ``primary`` is the (is_fraud, confidence) served."""
+        if not self.registry.shadows:
+            return False
+        if not self._slots.acquire(blocking=False):
+            metrics.inc("shadow_dropped_total")
+            return False
+        self._executor.submit(self._run, context, features, primary)
+        return True
+
+    def _run(self, context: dict, features: dict, primary: tuple):
+        try:
+            rows = []
+            for model in self.registry.shadows:
+                try:
+                    is_fraud, confidence, elapsed = timed_score(model, features)
+                except Exception as e:
+                    throttled.print(
+                        f"shadow_failed:{model.model_id}",
+                        f"Shadow model {model.model_id} failed: {e}",
+                    )
+                    metrics.inc("shadow_errors_total", model=model.model_id)
+                    continue
+                rows.append(
+                    {
+                        **context,
+                        "model": model.model_id,
+                        "is_fraud": is_fraud,
+                        "confidence": confidence,
+                        "latency_ms": elapsed * 1000,
+                        "primary_model": self.registry.primary.model_id,
+                        "primary_is_fraud": primary[0],
+                        "primary_confidence": primary[1],
+                    }
+                )
+            if rows:
+                self.log.add(rows)
+        finally:
+            self._slots.release()
+
+    def shutdown(self):
+        """Wait for queued shadow scoring to finish."""
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,66 @@
+# src/on_demand.py
+"""Request-time (on-demand) features combining the incoming transaction with
+the stored 7-day aggregates.
+
+Computed natively with numpy rather than through a Feast
+``OnDemandFeatureView``: the transform is a handful of vectorized array ops,
+so it costs microseconds per batch instead of a per-call pandas round trip.
+Missing aggregates (``None``) propagate as ``NaN`` and come out as ``None``.
+"""
+
+import numpy as np
+
+# More than this many transactions in 7 days counts as high velocity
+VELOCITY_THRESHOLD = 50
+
+REQUEST_FEATURES = [
+    "amount_to_avg_ratio",
+    "amount_zscore_7d",
+    "exceeds_velocity_threshold",
+]
+
+
+def compute_request_features(
+    transaction_amount,
+    avg_transaction_amount_7d,
+    std_transaction_amount_7d,
+    transaction_count_7d,
+    velocity_threshold: int = VELOCITY_THRESHOLD,
+) -> dict:
+    """Compute request-time features for a batch of transactions.
+
+    All inputs are equal-length sequences (or arrays). Returns a dict of numpy
+    arrays keyed by ``REQUEST_FEATURES``. The z-score uses the 7-day standard
+    deviation, falling back to the 7-day mean as the scale when the deviation
+    is missing or zero.
+    """
+    amount = np.asarray(transaction_amount, dtype=np.float64)
+    avg = np.asarray(avg_transaction_amount_7d, dtype=np.float64)
+    std = np.asarray(std_transaction_amount_7d, dtype=np.float64)
+    count = np.asarray(transaction_count_7d, dtype=np.float64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(avg > 0, amount / avg, np.nan)
+        scale = np.where(std > 0, std, avg)
+        zscore = np.where(scale > 0, (amount - avg) / scale, np.nan)
+
+    return {
+        "amount_to_avg_ratio": ratio,
+        "amount_zscore_7d": zscore,
+        # NaN compares False, so users without history are never "high velocity"
+        "exceeds_velocity_threshold": count > velocity_threshold,
+    }
+
+
+def request_features_for(transaction_amount: float, features: dict) -> dict:
+    """Single-request helper: Feast ``to_dict()`` features in, same format out."""
+    computed = compute_request_features(
+        [transaction_amount],
+        features["avg_transaction_amount_7d"],
+        features.get("std_transaction_amount_7d", [None]),
+        features["transaction_count_7d"],
+    )
+    return {
+        name: [None if value != value else value.item() for value in values]
+        for name, values in computed.items()
+    }
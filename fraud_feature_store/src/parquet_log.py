@@ -0,0 +1,100 @@
+# src/parquet_log.py
+"""Append-only parquet logs written as one file per flushed batch."""
+
+import itertools
+import os
+import time
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+class RollingParquetWriter:
+    """Writes each batch of rows to a new parquet file under ``directory``.
+
+    Files are named ``<prefix>-<utc timestamp>-<pid>-<sequence>.parquet``, so
+    they sort chronologically, several workers can share a directory, and a
+    reader can load it as one dataset (``pd.read_parquet(directory)``).
+
+    After every write, the oldest ``<prefix>-*`` files are deleted while there
+    are more than ``max_files``, they total more than ``max_bytes``, or they
+    are older than ``max_age_s``. ``None`` disables a limit.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        prefix: str,
+        compression: str = "snappy",
+        max_files: int | None = None,
+        max_bytes: int | None = None,
+        max_age_s: float | None = None,
+    ):
+        self.directory = directory
+        self.prefix = prefix
+        self.compression = compression
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.max_age_s = max_age_s
+        self._sequence = itertools.count()
+
+    def write(self, rows: list, schema: pa.Schema | None = None) -> str:
+        """Write ``rows`` (a list of flat dicts) and return the file path.
+
+        Without ``schema`` column types are inferred from this batch alone, so
+        a column that is null throughout is typed ``null`` and will not read
+        back together with files where it has values. Pass a fixed schema
+        when columns can be empty.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+        path = os.path.join(
+            self.directory,
+            f"{self.prefix}-{stamp}-{os.getpid()}-{next(self._sequence):06d}.parquet",
+        )
+        if schema is not None:
+            table = pa.Table.from_pylist(rows, schema=schema)
+        else:
+            # Columns are the union over all rows; from_pylist would only use the first
+            columns = dict.fromkeys(key for row in rows for key in row)
+            table = pa.Table.from_pydict(
+                {c: [row.get(c) for row in rows] for c in columns}
+            )
+        pq.write_table(table, path, compression=self.compression)
+        self.enforce_retention()
+        return path
+
+    def enforce_retention(self) -> int:
+        """Delete the oldest files beyond the limits; returns how many."""
+        if self.max_files is None and self.max_bytes is None and self.max_age_s is None:
+            return 0
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.startswith(f"{self.prefix}-") and entry.name.endswith(
+                ".parquet"
+            ):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:  # removed by another worker
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        files.sort()
+
+        now = time.time()
+        total_bytes = sum(size for _, size, _ in files)
+        removed = 0
+        for mtime, size, path in files:
+            remaining = len(files) - removed
+            if not (
+                (self.max_files is not None and remaining > self.max_files)
+                or (self.max_bytes is not None and total_bytes > self.max_bytes)
+                or (self.max_age_s is not None and now - mtime > self.max_age_s)
+            ):
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+            removed += 1
+        return removed
@@ -0,0 +1,176 @@
+# src/prediction_log.py
+"""Asynchronous log of what ``/predict`` served, for training-serving skew.
+
+The request path only drops a reference into a fixed-size ring buffer; a
+background thread drains it, flattens the records into rows and writes them
+as zstd-compressed parquet files. When the writer falls behind, new records
+are dropped and counted instead of growing memory or blocking requests.
+"""
+
+import threading
+
+import pyarrow as pa
+
+from .metrics import metrics
+from .parquet_log import RollingParquetWriter
+
+
+class RingBuffer:
+    """Fixed-capacity single-producer / single-consumer ring buffer.
+
+    Lock-free under the GIL: the producer only advances ``_head`` and the
+    consumer only advances ``_tail``, each a single attribute store published
+    after the slot is written or read. This holds as long as there is one
+    producing thread (the event loop, for async handlers) and one consumer.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._slots = [None] * capacity
+        self._head = 0  # total items ever written
+        self._tail = 0  # total items ever read
+        self.dropped = 0
+
+    def __len__(self):
+        return self._head - self._tail
+
+    def put(self, item) -> bool:
+        """Append ``item``, or count it as dropped if the buffer is full."""
+        head = self._head
+        if head - self._tail >= self.capacity:
+            self.dropped += 1
+            return False
+        self._slots[head % self.capacity] = item
+        self._head = head + 1
+        return True
+
+    def drain(self, max_items: int | None = None) -> list:
+        """Remove and return up to ``max_items`` items, oldest first."""
+        tail = self._tail
+        count = self._head - tail
+        if max_items is not None:
+            count = min(count, max_items)
+        items = []
+        for i in range(tail, tail + count):
+            slot = i % self.capacity
+            items.append(self._slots[slot])
+            self._slots[slot] = None
+        self._tail = tail + count
+        return items
+
+
+# Fields of a ``/predict`` log record, besides its ``features``
+PREDICTION_FIELDS = [
+    pa.field("request_id", pa.string()),
+    pa.field("served_at", pa.timestamp("us", tz="UTC")),
+    pa.field("user_id", pa.int64()),
+    pa.field("transaction_amount", pa.float64()),
+    pa.field("is_fraud", pa.bool_()),
+    pa.field("confidence", pa.float64()),
+    pa.field("model", pa.string()),
+    pa.field("degraded", pa.bool_()),
+    pa.field("degraded_reason", pa.string()),
+    pa.field("latency_ms", pa.float64()),
+]
+
+
+def prediction_schema(feature_names: list) -> pa.Schema:
+    """Fixed schema of the log files: record fields, then float features.
+
+    Every file is written with it, so a column that happens to be null for a
+    whole batch (``degraded_reason`` when all went well, merchant features
+    when no merchant was named) keeps its type and the directory reads back
+    as one dataset.
+    """
+    return pa.schema(
+        PREDICTION_FIELDS
+        + [pa.field(f"feature__{name}", pa.float64()) for name in feature_names]
+    )
+
+
+def flatten_record(record: dict, feature_names: list) -> dict:
+    """One row per prediction: Feast-style ``[value]`` features become columns.
+
+    Every name in ``feature_names`` gets a ``feature__<name>`` column, null
+    when not served (e.g. rules-only degraded responses), so all files share
+    one schema.
+    """
+    row = {k: v for k, v in record.items() if k != "features"}
+    features = record["features"]
+    for name in feature_names:
+        values = features.get(name)
+        row[f"feature__{name}"] = values[0] if values else None
+    return row
+
+
+class PredictionLogger:
+    """Ring buffer drained to rolling parquet files by a background thread."""
+
+    def __init__(
+        self,
+        writer: RollingParquetWriter,
+        feature_names: list,
+        capacity: int = 65_536,
+        flush_interval_s: float = 5.0,
+        max_rows_per_file: int = 50_000,
+    ):
+        self.writer = writer
+        self.feature_names = feature_names
+        self.schema = prediction_schema(feature_names)
+        self.flush_interval_s = flush_interval_s
+        self.max_rows_per_file = max_rows_per_file
+        self._buffer = RingBuffer(capacity)
+        self._dropped_reported = 0
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def log(self, record: dict) -> bool:
+        """Request-path entry point: no I/O, no locks, no formatting."""
+        return self._buffer.put(record)
+
+    def flush(self) -> int:
+        """Write everything buffered so far; returns the number of rows."""
+        written = 0
+        while True:
+            records = self._buffer.drain(self.max_rows_per_file)
+            if not records:
+                break
+            try:
+                self.writer.write(
+                    [flatten_record(r, self.feature_names) for r in records],
+                    self.schema,
+                )
+            except Exception as e:
+                print(f"Prediction log flush of {len(records)} rows failed: {e}")
+                metrics.inc("prediction_log_write_failures_total")
+                metrics.inc("prediction_log_dropped_total", len(records))
+                continue
+            written += len(records)
+        metrics.inc("prediction_log_rows_written_total", written)
+        # The producer only bumps a plain int; publish its delta from here
+        dropped = self._buffer.dropped
+        metrics.inc("prediction_log_dropped_total", dropped - self._dropped_reported)
+        self._dropped_reported = dropped
+        metrics.set_gauge("prediction_log_buffered", len(self._buffer))
+        return written
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="prediction-log-flusher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background flusher and write whatever is still buffered."""
+        if self._thread is not None:
+            self._stopping.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        while not self._stopping.wait(self.flush_interval_s):
+            self.flush()
@@ -0,0 +1,136 @@
+# src/profiling.py
+"""Opt-in profiling of the running service.
+
+``sample_stacks`` is a wall-clock sampling profiler: it periodically snapshots
+every thread's Python stack and aggregates them as collapsed stacks, the
+input format of flamegraph.pl / speedscope. ``SlowRequestProfiler`` is ASGI
+middleware that runs ``cProfile`` on a sample of requests and keeps the
+profiles of those that exceed a latency threshold.
+
+Nothing here runs unless explicitly enabled: the sampler only exists for the
+duration of an admin call, and the middleware is only installed when a slow
+request threshold is configured.
+"""
+
+import cProfile
+import io
+import pstats
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+# Only one sampling session at a time; overlapping ones would skew each other
+_sampling_lock = threading.Lock()
+
+
+class ProfilerBusy(Exception):
+    """Raised when a sampling session is already running."""
+
+
+def _collapse(frame) -> str:
+    """Render a stack root-first as ``file:function;file:function``."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_filename.rsplit('/', 1)[-1]}:{code.co_qualname}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def sample_stacks(duration_s: float, interval_s: float = 0.005) -> Counter:
+    """Sample all threads' stacks for ``duration_s``; returns stack -> count.
+
+    Stacks are prefixed with the thread name, so the event loop, Feast worker
+    threads and background flushers show up as separate roots. Blocks the
+    calling thread, so call it off the event loop.
+    """
+    if not _sampling_lock.acquire(blocking=False):
+        raise ProfilerBusy()
+    try:
+        own_id = threading.get_ident()
+        stacks = Counter()
+        deadline = time.monotonic() + duration_s
+        while time.monotonic() < deadline:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                thread_name = names.get(thread_id, str(thread_id))
+                stacks[f"{thread_name};{_collapse(frame)}"] += 1
+            time.sleep(interval_s)
+        return stacks
+    finally:
+        _sampling_lock.release()
+
+
+def format_collapsed(stacks: Counter) -> str:
+    """Collapsed-stack text, one ``stack count`` line per distinct stack."""
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+class SlowRequestProfiler:
+    """ASGI middleware keeping cProfile output for slow sampled requests.
+
+    A ``sample_rate`` fraction of HTTP requests is profiled; a profile is
+    appended to ``profiles`` when the request took longer than
+    ``threshold_ms``. cProfile can only be active once per process, so a
+    request arriving while another is profiled is simply not profiled. The
+    profile covers everything the process did while the request was in
+    flight, including other concurrent requests.
+    """
+
+    def __init__(
+        self,
+        app,
+        profiles: deque,
+        threshold_ms: float,
+        sample_rate: float = 0.01,
+        top_n: int = 30,
+    ):
+        self.app = app
+        # Owned by the caller, which serves it; bound it with deque(maxlen=...)
+        self.profiles = profiles
+        self.threshold_ms = threshold_ms
+        self.sample_rate = sample_rate
+        self.top_n = top_n
+        self._active = threading.Lock()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or random.random() >= self.sample_rate:
+            return await self.app(scope, receive, send)
+        if not self._active.acquire(blocking=False):
+            return await self.app(scope, receive, send)
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiling tool (e.g. a debugger) holds the profiler hook
+            self._active.release()
+            return await self.app(scope, receive, send)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiler.disable()
+            self._active.release()
+            duration_ms = (time.perf_counter() - start) * 1000
+            if duration_ms > self.threshold_ms:
+                self._keep(scope, duration_ms, profiler)
+
+    def _keep(self, scope, duration_ms: float, profiler: cProfile.Profile):
+        out = io.StringIO()
+        stats = pstats.Stats(profiler, stream=out)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top_n)
+        self.profiles.append(
+            {
+                "method": scope["method"],
+                "path": scope["path"],
+                "duration_ms": round(duration_ms, 3),
+                "captured_at": time.time(),
+                "stats": out.getvalue(),
+            }
+        )
@@ -0,0 +1,219 @@
+# src/resilience.py
+"""Load-shedding guards placed in front of the online feature store.
+
+``CircuitBreaker`` stops calling a store that is failing or slow, and
+``AdaptiveConcurrencyLimiter`` caps in-flight store calls with an AIMD limit
+that shrinks as latency rises. Both publish their state to ``metrics``.
+"""
+
+import threading
+import time
+from collections import deque
+
+from .metrics import metrics
+
+
+class CircuitOpenError(Exception):
+    """Raised when the circuit breaker is rejecting calls."""
+
+
+class ConcurrencyLimitExceeded(Exception):
+    """Raised when the concurrency limiter has no free slot."""
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker driven by error rate and slow-call rate.
+
+    While closed, the outcomes of the last ``window_size`` calls are kept. Once
+    at least ``min_calls`` are recorded, the breaker opens if the share of
+    failures reaches ``error_rate_threshold`` or the share of calls slower
+    than ``slow_call_s`` reaches ``slow_call_rate_threshold``. After
+    ``open_duration_s`` it lets ``half_open_max_calls`` trial calls through:
+    all succeeding closes it, any failing re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    # Numeric encoding for the state gauge
+    _STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(
+        self,
+        name: str,
+        window_size: int = 20,
+        min_calls: int = 10,
+        error_rate_threshold: float = 0.5,
+        slow_call_s: float = 0.1,
+        slow_call_rate_threshold: float = 0.5,
+        open_duration_s: float = 5.0,
+        half_open_max_calls: int = 3,
+        clock=time.monotonic,
+    ):
+        self.name = name
+        self.window_size = window_size
+        self.min_calls = min_calls
+        self.error_rate_threshold = error_rate_threshold
+        self.slow_call_s = slow_call_s
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.open_duration_s = open_duration_s
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            # (failed, slow) per call, newest last
+            self._outcomes = deque(maxlen=self.window_size)
+            self._opened_at = 0.0
+            self._half_open_started = 0
+            self._half_open_succeeded = 0
+            self._transition(self.CLOSED)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Whether a call may proceed; counts as a trial call when half-open."""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == self.CLOSED:
+                return True
+            if (
+                self._state == self.HALF_OPEN
+                and self._half_open_started < self.half_open_max_calls
+            ):
+                self._half_open_started += 1
+                return True
+            metrics.inc("circuit_breaker_rejected_total", breaker=self.name)
+            return False
+
+    def record_success(self, latency_s: float):
+        self._record(failed=False, slow=latency_s > self.slow_call_s)
+
+    def record_failure(self):
+        self._record(failed=True, slow=False)
+
+    def _record(self, failed: bool, slow: bool):
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                # A slow trial call means the store has not recovered either
+                if failed or slow:
+                    self._open()
+                else:
+                    self._half_open_succeeded += 1
+                    if self._half_open_succeeded >= self.half_open_max_calls:
+                        self._outcomes.clear()
+                        self._transition(self.CLOSED)
+                return
+            if self._state == self.OPEN:
+                # Late result of a call started before the breaker opened
+                return
+
+            self._outcomes.append((failed, slow))
+            calls = len(self._outcomes)
+            if calls < self.min_calls:
+                return
+            error_rate = sum(f for f, _ in self._outcomes) / calls
+            slow_rate = sum(s for _, s in self._outcomes) / calls
+            if (
+                error_rate >= self.error_rate_threshold
+                or slow_rate >= self.slow_call_rate_threshold
+            ):
+                self._open()
+
+    def _open(self):
+        self._opened_at = self._clock()
+        self._transition(self.OPEN)
+
+    def _maybe_half_open(self):
+        if (
+            self._state == self.OPEN
+            and self._clock() - self._opened_at >= self.open_duration_s
+        ):
+            self._half_open_started = 0
+            self._half_open_succeeded = 0
+            self._transition(self.HALF_OPEN)
+
+    def _transition(self, state: str):
+        self._state = state
+        metrics.set_gauge(
+            "circuit_breaker_state", self._STATE_VALUES[state], breaker=self.name
+        )
+        metrics.inc("circuit_breaker_transitions_total", breaker=self.name, to=state)
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD limit on concurrent calls.
+
+    A call that fails or takes longer than ``latency_threshold_s`` shrinks the
+    limit multiplicatively by ``backoff_ratio``. A healthy call grows it by one
+    when the limiter is at least half used, so an idle service does not inflate
+    its limit without evidence the store can take it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int = 20,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        latency_threshold_s: float = 0.05,
+        backoff_ratio: float = 0.9,
+    ):
+        self.name = name
+        self.initial_limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_threshold_s = latency_threshold_s
+        self.backoff_ratio = backoff_ratio
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._limit = float(self.initial_limit)
+            self._inflight = 0
+            self._publish()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def inflight(self) -> int:
+        return self._inflight
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self._inflight >= int(self._limit):
+                metrics.inc("concurrency_limiter_rejected_total", limiter=self.name)
+                return False
+            self._inflight += 1
+            self._publish()
+            return True
+
+    def release(self, latency_s: float, failed: bool = False):
+        """Free a slot and adapt the limit to the call's outcome."""
+        with self._lock:
+            if failed or latency_s > self.latency_threshold_s:
+                self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+            elif self._inflight * 2 >= self._limit:
+                self._limit = min(self.max_limit, self._limit + 1)
+            self._inflight -= 1
+            self._publish()
+
+    def cancel(self):
+        """Free a slot without adapting, for calls that never reached the store."""
+        with self._lock:
+            self._inflight -= 1
+            self._publish()
+
+    def _publish(self):
+        metrics.set_gauge("concurrency_limit", int(self._limit), limiter=self.name)
+        metrics.set_gauge("concurrency_inflight", self._inflight, limiter=self.name)
@@ -0,0 +1,104 @@
+# src/retrieval.py
+"""Multi-entity online feature retrieval.
+
+A request names several entities (user, merchant, device). Each entity is
+served by one or more feature views; one lookup is issued per feature view,
+all concurrently, and the results are joined into a single Feast-style
+``to_dict()`` result. Adding entities therefore adds parallel lookups, not
+serial round trips.
+"""
+
+import asyncio
+
+from .log_throttle import throttled
+from .metrics import metrics
+from .resilience import AdaptiveConcurrencyLimiter, CircuitBreaker
+
+
+class EntityFeatureView:
+    """Features of one feature view, looked up by a single entity join key.
+
+    A ``required`` view's failure fails the whole retrieval; an optional
+    view's failure only leaves its features as ``None``. With
+    ``include_event_timestamps`` each feature comes with its event time, as
+    ``<feature>__ts`` in epoch seconds. ``breaker`` and
+    ``limiter`` guard this view's lookups alone, so one view's outage does
+    not shed load from the others.
+    """
+
+    def __init__(
+        self,
+        entity: str,
+        feature_view: str,
+        features: list,
+        required: bool = False,
+        include_event_timestamps: bool = False,
+        breaker: CircuitBreaker | None = None,
+        limiter: AdaptiveConcurrencyLimiter | None = None,
+    ):
+        self.entity = entity
+        self.feature_view = feature_view
+        self.features = features
+        self.required = required
+        self.include_event_timestamps = include_event_timestamps
+        self.breaker = breaker
+        self.limiter = limiter
+
+    @property
+    def feature_refs(self) -> list:
+        return [f"{self.feature_view}:{name}" for name in self.features]
+
+
+class MultiEntityRetriever:
+    """Resolves several entities against their feature views in parallel.
+
+    ``fetch`` is an async callable ``fetch(view, entity_rows, timeout_s)``
+    returning a Feast ``to_dict()`` result, e.g. the online store call behind
+    the view's breaker and limiter. Lookups run concurrently, so the whole
+    retrieval is bounded by one ``timeout_s``.
+    """
+
+    def __init__(self, fetch, views: list):
+        names = [name for view in views for name in view.features]
+        duplicates = {name for name in names if names.count(name) > 1}
+        if duplicates:
+            raise ValueError(
+                f"Feature names must be unique across views: {sorted(duplicates)}"
+            )
+        self.fetch = fetch
+        self.views = views
+
+    def empty_features(self, view: EntityFeatureView, entity_value) -> dict:
+        return {view.entity: [entity_value], **{name: [None] for name in view.features}}
+
+    async def retrieve(self, entities: dict, timeout_s: float) -> dict:
+        """Look up every view whose entity is in ``entities`` and join results.
+
+        Entities with a ``None`` value are skipped. Raises the first required
+        view's exception, if any.
+        """
+        views = [view for view in self.views if entities.get(view.entity) is not None]
+        results = await asyncio.gather(
+            *(
+                self.fetch(view, [{view.entity: entities[view.entity]}], timeout_s)
+                for view in views
+            ),
+            return_exceptions=True,
+        )
+
+        joined = {}
+        for view, result in zip(views, results):
+            if isinstance(result, BaseException):
+                if view.required:
+                    raise result
+                throttled.print(
+                    f"feature_view_failed:{view.feature_view}",
+                    f"Optional feature view {view.feature_view} failed: {result!r}",
+                )
+                metrics.inc(
+                    "feature_view_lookup_failures_total",
+                    feature_view=view.feature_view,
+                )
+                result = self.empty_features(view, entities[view.entity])
+            joined.update(result)
+        return joined
@@ -5,9 +5,19 @@ import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import Mock, MagicMock
 import pandas as pd
+import time
 from datetime import datetime, timedelta
 
 
+def no_live_transactions(entity_rows):
+    """Live bucket lookup result for users with nothing ingested yet."""
+    names = ["live_bucket_hour", "live_counts", "live_sums", "live_sum_sqs"]
+    return {
+        "user_id": [row["user_id"] for row in entity_rows],
+        **{name: [None] * len(entity_rows) for name in names},
+    }
+
+
 @pytest.fixture
 def mock_feature_store():
     """Mock Feast FeatureStore for testing without actual data."""
@@ -15,43 +25,66 @@ def mock_feature_store():
 
     # Mock successful feature retrieval
     def mock_get_online_features(features, entity_rows):
-        user_id = entity_rows[0]["user_id"]
+        row = entity_rows[0]
+        if features[0].startswith("user_live_transaction_features:"):
+            return MagicMock(to_dict=lambda **_: no_live_transactions(entity_rows))
+        if "merchant_id" in row:
+            return MagicMock(
+                to_dict=lambda **_: {
+                    "merchant_id": [row["merchant_id"]],
+                    "merchant_transaction_count_7d": [812],
+                    "merchant_fraud_rate_30d": [0.02],
+                }
+            )
+        if "device_id" in row:
+            return MagicMock(
+                to_dict=lambda **_: {
+                    "device_id": [row["device_id"]],
+                    "device_user_count_30d": [3],
+                    "device_age_days": [41],
+                }
+            )
+        user_id = row["user_id"]
 
         # Simulate different users with different feature values
         if user_id == 1005:
             # Normal user with low transaction amount
             return MagicMock(
-                to_dict=lambda: {
+                to_dict=lambda **_: {
                     "user_id": [user_id],
                     "transaction_count_7d": [37],
                     "avg_transaction_amount_7d": [296.62],
+                    "std_transaction_amount_7d": [120.0],
                 }
             )
         elif user_id == 2000:
             # Fraudulent user with high transaction amount
             return MagicMock(
-                to_dict=lambda: {
+                to_dict=lambda **_: {
                     "user_id": [user_id],
                     "transaction_count_7d": [150],
                     "avg_transaction_amount_7d": [1500.0],
+                    "std_transaction_amount_7d": [600.0],
                 }
             )
         elif user_id == 9999:
             # User not found in feature store
             return MagicMock(
-                to_dict=lambda: {
+                to_dict=lambda **_: {
                     "user_id": [user_id],
                     "transaction_count_7d": [None],
                     "avg_transaction_amount_7d": [None],
+                    "std_transaction_amount_7d": [None],
                 }
             )
         else:
             # Default user
             return MagicMock(
-                to_dict=lambda: {
+                to_dict=lambda **_: {
                     "user_id": [user_id],
                     "transaction_count_7d": [20],
                     "avg_transaction_amount_7d": [500.0],
+                    "std_transaction_amount_7d": [200.0],
                 }
             )
 
@@ -59,8 +92,45 @@ def mock_feature_store():
     return mock_fs
 
 
+class FaultInjectingStore:
+    """Local stand-in for the online store with injectable latency and errors.
+
+    Every ``error_every``-th call raises (0 disables errors) and every call
+    sleeps ``latency_s`` first, so tests can drive the store from healthy to
+    failing to slow and back.
+    """
+
+    def __init__(self, latency_s=0.0, error_every=0):
+        self.latency_s = latency_s
+        self.error_every = error_every
+        self.calls = 0
+
+    def get_online_features(self, features, entity_rows):
+        self.calls += 1
+        time.sleep(self.latency_s)
+        if self.error_every and self.calls % self.error_every == 0:
+            raise ConnectionError("injected online store fault")
+        if features[0].startswith("user_live_transaction_features:"):
+            return MagicMock(to_dict=lambda **_: no_live_transactions(entity_rows))
+        user_id = entity_rows[0]["user_id"]
+        return MagicMock(
+            to_dict=lambda **_: {
+                "user_id": [user_id],
+                "transaction_count_7d": [20],
+                "avg_transaction_amount_7d": [500.0],
+                "std_transaction_amount_7d": [200.0],
+            }
+        )
+
+
 @pytest.fixture
-def test_client(mock_feature_store, monkeypatch):
+def faulty_feature_store():
+    """Healthy fault-injecting store; tests tune its latency and error rate."""
+    return FaultInjectingStore()
+
+
+@pytest.fixture
+def test_client(mock_feature_store, monkeypatch, tmp_path):
     """FastAPI test client with mocked feature store."""
     import sys
     import os
@@ -72,9 +142,51 @@ def test_client(mock_feature_store, monkeypatch):
 
     # Mock the feature store before importing app
     import src.app as app_module
+    from src.batching import BatchBuffer
+    from src.models import ModelRegistry, ShadowScorer
+    from src.parquet_log import RollingParquetWriter
+    from src.prediction_log import PredictionLogger
 
     monkeypatch.setattr(app_module, "fs", mock_feature_store)
 
+    # Generous latency budget so a slow CI box never degrades by accident;
+    # timeout tests set their own budget via the request header
+    monkeypatch.setattr(app_module, "MAX_FEATURE_TIMEOUT_MS", 2000.0)
+    monkeypatch.setattr(app_module, "FEATURE_TIMEOUT_MS", 2000.0)
+    for view in app_module.FEATURE_VIEWS:
+        monkeypatch.setattr(view.breaker, "slow_call_s", 2.0)
+        monkeypatch.setattr(view.limiter, "latency_threshold_s", 2.0)
+
+    # Start every test with empty fallback cache, counters and closed breakers
+    app_module.feature_cache.clear()
+    app_module.metrics.reset()
+    for view in app_module.FEATURE_VIEWS:
+        view.breaker.reset()
+        view.limiter.reset()
+    monkeypatch.setattr(
+        app_module,
+        "ingest_buffer",
+        BatchBuffer("ingest", app_module.push_transactions, flush_size=1000),
+    )
+
+    # No shadow models by default; shadow scores go to a per-test directory
+    shadow_log = BatchBuffer(
+        "shadow_log",
+        RollingParquetWriter(str(tmp_path / "shadow_scores"), "shadow_scores").write,
+    )
+    registry = ModelRegistry(app_module.model_registry.primary)
+    monkeypatch.setattr(app_module, "model_registry", registry)
+    monkeypatch.setattr(app_module, "shadow_log", shadow_log)
+    monkeypatch.setattr(app_module, "shadow_scorer", ShadowScorer(registry, shadow_log))
+    monkeypatch.setattr(
+        app_module,
+        "prediction_logger",
+        PredictionLogger(
+            RollingParquetWriter(str(tmp_path / "predictions"), "predictions"),
+            feature_names=app_module.prediction_logger.feature_names,
+        ),
+    )
+
     from fastapi.testclient import TestClient
 
     client = TestClient(app_module.app)
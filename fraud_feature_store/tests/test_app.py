@@ -92,21 +92,156 @@ def test_predict_invalid_input(test_client):
 
 @pytest.mark.unit
 def test_predict_feature_store_error(test_client, mock_feature_store):
-    """Test prediction when feature store retrieval fails."""
+    """Test prediction degrades to amount-only rules when retrieval fails."""
     # Make the mock raise an exception
     mock_feature_store.get_online_features.side_effect = Exception(
         "Redis connection failed"
     )
 
     response = test_client.post(
-        "/predict", json={"user_id": 1005, "transaction_amount": 500.0}
+        "/predict", json={"user_id": 1005, "transaction_amount": 5000.0}
     )
 
-    # Should return 500 when feature store fails
-    assert response.status_code == 500
+    # Should still answer, flagged as degraded
+    assert response.status_code == 200
     data = response.json()
-    assert "detail" in data
-    assert "retrieval failed" in data["detail"].lower()
+    assert data["degraded"] is True
+    assert data["degraded_reason"] == "store_error:rules"
+    assert data["is_fraud"] is True
+    assert data["features_fetched"] == {}
+
+
+@pytest.mark.unit
+def test_predict_degraded_uses_last_known_features(test_client, mock_feature_store):
+    """Test that a failed retrieval falls back to the last features served."""
+    response = test_client.post(
+        "/predict", json={"user_id": 2000, "transaction_amount": 10.0}
+    )
+    assert response.json()["degraded"] is False
+
+    mock_feature_store.get_online_features.side_effect = Exception("down")
+
+    response = test_client.post(
+        "/predict", json={"user_id": 2000, "transaction_amount": 10.0}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["degraded"] is True
+    assert data["degraded_reason"] == "store_error:cache"
+    # Cached avg of 1500.0 still flags the user, despite the small amount
+    assert data["is_fraud"] is True
+    assert data["features_fetched"]["avg_transaction_amount_7d"] == [1500.0]
+
+
+@pytest.mark.unit
+def test_predict_timeout_degrades(test_client, mock_feature_store):
+    """Test that a slow store is cut off at the request's latency budget."""
+    import time
+
+    def slow_get_online_features(features, entity_rows):
+        time.sleep(0.5)
+        raise AssertionError("response should not wait for the store")
+
+    mock_feature_store.get_online_features.side_effect = slow_get_online_features
+
+    # Keep one event loop alive across the request, as in a real server, so
+    # the abandoned store call does not block loop shutdown
+    with test_client:
+        start = time.perf_counter()
+        response = test_client.post(
+            "/predict",
+            json={"user_id": 1005, "transaction_amount": 50.0},
+            headers={"X-Request-Timeout-Ms": "20"},
+        )
+        elapsed = time.perf_counter() - start
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["degraded"] is True
+    assert data["degraded_reason"] == "timeout:rules"
+    assert data["is_fraud"] is False
+    assert elapsed < 0.4
+
+
+@pytest.mark.unit
+def test_predict_invalid_timeout_header(test_client):
+    """Test that a non-positive latency budget is rejected."""
+    response = test_client.post(
+        "/predict",
+        json={"user_id": 1005, "transaction_amount": 50.0},
+        headers={"X-Request-Timeout-Ms": "0"},
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.unit
+def test_predict_timeout_header_is_clamped(
+    test_client, mock_feature_store, monkeypatch
+):
+    """Test that an oversized latency budget is capped at the configured max."""
+    import time
+
+    import src.app as app_module
+
+    monkeypatch.setattr(app_module, "MAX_FEATURE_TIMEOUT_MS", 20.0)
+
+    def slow_get_online_features(features, entity_rows):
+        time.sleep(0.5)
+        raise AssertionError("response should not wait for the store")
+
+    mock_feature_store.get_online_features.side_effect = slow_get_online_features
+
+    with test_client:
+        start = time.perf_counter()
+        response = test_client.post(
+            "/predict",
+            json={"user_id": 1005, "transaction_amount": 50.0},
+            headers={"X-Request-Timeout-Ms": "1000000000"},
+        )
+        elapsed = time.perf_counter() - start
+
+    assert response.json()["degraded_reason"] == "timeout:rules"
+    assert elapsed < 0.4
+
+
+@pytest.mark.unit
+def test_degradation_metrics(test_client, mock_feature_store):
+    """Test that degraded predictions are counted by reason and source."""
+    test_client.post("/predict", json={"user_id": 1005, "transaction_amount": 5.0})
+    mock_feature_store.get_online_features.side_effect = Exception("down")
+    test_client.post("/predict", json={"user_id": 1005, "transaction_amount": 5.0})
+    test_client.post("/predict", json={"user_id": 42, "transaction_amount": 5.0})
+
+    counters = test_client.get("/metrics").json()["counters"]
+    assert counters["predict_requests_total"] == 3
+    assert counters['predict_degraded_total{reason="store_error",source="cache"}'] == 1
+    assert counters['predict_degraded_total{reason="store_error",source="rules"}'] == 1
+
+
+@pytest.mark.unit
+def test_degraded_requests_log_is_throttled(
+    test_client, mock_feature_store, monkeypatch, capsys
+):
+    """Test that an outage prints one line per interval, not one per request."""
+    import src.app as app_module
+    from src.log_throttle import ThrottledPrinter
+
+    clock = Mock(return_value=0.0)
+    monkeypatch.setattr(
+        app_module, "throttled", ThrottledPrinter(interval_s=10.0, clock=clock)
+    )
+    mock_feature_store.get_online_features.side_effect = Exception("down")
+
+    for _ in range(5):
+        test_client.post("/predict", json={"user_id": 42, "transaction_amount": 5.0})
+    assert capsys.readouterr().out.count("retrieval failed") == 1
+
+    clock.return_value = 11.0
+    test_client.post("/predict", json={"user_id": 42, "transaction_amount": 5.0})
+    assert "(4 similar suppressed)" in capsys.readouterr().out
+
+    counters = test_client.get("/metrics").json()["counters"]
+    assert counters['predict_degraded_total{reason="store_error",source="rules"}'] == 6
 
 
 @pytest.mark.unit
@@ -155,3 +290,23 @@ def test_fraud_detection_logic(test_client):
     )
     assert response.status_code == 200
     assert response.json()["is_fraud"] is True
+
+
+@pytest.mark.unit
+def test_predict_includes_request_features(test_client):
+    """Test that the incoming amount is scored through request-time features."""
+    response = test_client.post(
+        "/predict", json={"user_id": 1005, "transaction_amount": 500.0}
+    )
+    features = response.json()["features_fetched"]
+    assert features["amount_to_avg_ratio"][0] == pytest.approx(500.0 / 296.62)
+    assert features["amount_zscore_7d"][0] == pytest.approx((500.0 - 296.62) / 120.0)
+    assert features["exceeds_velocity_threshold"] == [False]
+
+    # Same user, but an amount far above their usual spend
+    response = test_client.post(
+        "/predict", json={"user_id": 1005, "transaction_amount": 900.0}
+    )
+    data = response.json()
+    assert data["features_fetched"]["amount_zscore_7d"][0] > 4
+    assert data["is_fraud"] is True
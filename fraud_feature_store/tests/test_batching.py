@@ -0,0 +1,67 @@
+"""Tests for background event batching."""
+
+import threading
+
+import pytest
+
+from src.batching import BatchBuffer
+from src.metrics import metrics
+
+
+@pytest.mark.unit
+def test_batch_buffer_flushes_on_size():
+    """Test that reaching flush_size wakes the background flusher."""
+    flushed = []
+    done = threading.Event()
+
+    def flush_fn(batch):
+        flushed.append(batch)
+        done.set()
+
+    buffer = BatchBuffer("test", flush_fn, flush_size=3, flush_interval_s=60)
+    buffer.start()
+    try:
+        buffer.add([1, 2])
+        assert not done.wait(0.1)
+        buffer.add([3])
+        assert done.wait(5)
+    finally:
+        buffer.stop()
+
+    assert flushed == [[1, 2, 3]]
+    assert buffer.pending == 0
+
+
+@pytest.mark.unit
+def test_batch_buffer_flushes_on_interval():
+    """Test that a partial batch is flushed after flush_interval_s."""
+    done = threading.Event()
+    buffer = BatchBuffer(
+        "test", lambda batch: done.set(), flush_size=100, flush_interval_s=0.05
+    )
+    buffer.start()
+    try:
+        buffer.add([1])
+        assert done.wait(5)
+    finally:
+        buffer.stop()
+
+
+@pytest.mark.unit
+def test_batch_buffer_bounded_and_counts_failures():
+    """Test that a full buffer rejects events and failed flushes are counted."""
+    metrics.reset()
+
+    def failing_flush(batch):
+        raise ConnectionError("store down")
+
+    buffer = BatchBuffer("test", failing_flush, max_pending=3)
+    assert buffer.add([1, 2]) is True
+    assert buffer.add([3, 4]) is False
+    assert buffer.pending == 2
+
+    assert buffer.flush() == 0
+    assert buffer.pending == 0
+    assert metrics.get("test_events_rejected_total") == 2
+    assert metrics.get("test_flush_failures_total") == 1
+    assert metrics.get("test_events_dropped_total") == 2
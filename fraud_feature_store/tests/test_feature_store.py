@@ -54,6 +54,7 @@ def test_feature_view_schema_types():
 
     assert schema_dict["transaction_count_7d"] == Int64
     assert schema_dict["avg_transaction_amount_7d"] == Float32
+    assert schema_dict["std_transaction_amount_7d"] == Float32
 
 
 @pytest.mark.integration
@@ -79,9 +80,18 @@ def test_feature_service_definition():
 @pytest.mark.integration
 def test_feature_view_source():
     """Test that feature view is connected to the correct data source."""
-    from feature_store import user_transaction_fv, user_transactions_source
-
+    from feature_store import (
+        user_live_transaction_fv,
+        user_live_transactions_push_source,
+        user_transaction_fv,
+        user_transactions_source,
+    )
+
+    # Batch aggregates are only materialized; live transactions are pushed to
+    # a view of their own and never overwrite them
     assert user_transaction_fv.source == user_transactions_source
+    assert user_live_transaction_fv.stream_source == user_live_transactions_push_source
+    assert user_live_transactions_push_source.name == "user_live_transactions_push"
 
 
 @pytest.mark.integration
@@ -89,9 +99,41 @@ def test_all_required_features_defined():
     """Test that all features required by the app are defined."""
     from feature_store import user_transaction_fv
 
-    required_features = ["transaction_count_7d", "avg_transaction_amount_7d"]
+    required_features = [
+        "transaction_count_7d",
+        "avg_transaction_amount_7d",
+        "std_transaction_amount_7d",
+    ]
 
     field_names = [field.name for field in user_transaction_fv.schema]
 
     for feature in required_features:
         assert feature in field_names, f"Required feature {feature} not found in schema"
+
+
+@pytest.mark.integration
+def test_merchant_and_device_feature_views():
+    """Test that merchant and device views are keyed by their own entities."""
+    from feature_store import device, device_fv, merchant, merchant_transaction_fv
+    from feast.value_type import ValueType
+
+    assert merchant_transaction_fv.entities == [merchant.name]
+    assert device_fv.entities == [device.name]
+    assert device.value_type == ValueType.STRING
+    assert {f.name for f in merchant_transaction_fv.schema} == {
+        "merchant_transaction_count_7d",
+        "merchant_fraud_rate_30d",
+    }
+
+
+@pytest.mark.integration
+def test_multi_entity_feature_service():
+    """Test that the multi-entity service groups every entity's view."""
+    from feature_store import fraud_multi_entity_service
+
+    names = {p.name for p in fraud_multi_entity_service.feature_view_projections}
+    assert names == {
+        "user_transaction_features",
+        "merchant_transaction_features",
+        "device_features",
+    }
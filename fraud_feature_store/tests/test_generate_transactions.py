@@ -32,6 +32,7 @@ def test_generate_transaction_data_schema(tmp_path, monkeypatch):
         "event_timestamp",
         "transaction_count_7d",
         "avg_transaction_amount_7d",
+        "std_transaction_amount_7d",
         "created_timestamp",
     ]
 
@@ -0,0 +1,288 @@
+"""Tests for write-through ingestion of live transaction events."""
+
+import time
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.ingest import (
+    LIVE_FEATURES,
+    WINDOW_BUCKETS,
+    add_to_live_buckets,
+    bucket_hour,
+    combine_live_aggregates,
+    within_window,
+)
+
+
+def no_live_buckets(user_ids):
+    return {
+        "user_id": user_ids,
+        **{name: [None] * len(user_ids) for name in LIVE_FEATURES},
+    }
+
+
+@pytest.mark.unit
+def test_live_buckets_accumulate_per_hour():
+    """Test that events are added to their hour's bucket on top of stored ones."""
+    now = pd.Timestamp("2025-06-10 12:30", tz="UTC")
+    events = pd.DataFrame(
+        {
+            "user_id": [1005, 1005, 4242],
+            "transaction_amount": [100.0, 50.0, 75.0],
+            "event_timestamp": [now, now - pd.Timedelta(hours=2), now],
+        }
+    )
+
+    first = add_to_live_buckets(no_live_buckets([1005, 4242]), events, now)
+    rows = first.set_index("user_id")
+    assert rows.loc[1005, "live_bucket_hour"] == bucket_hour(now.timestamp())
+    assert rows.loc[1005, "live_counts"] == [1, 0, 1]
+    assert rows.loc[1005, "live_sums"] == [100.0, 0.0, 50.0]
+    assert rows.loc[1005, "live_sum_sqs"] == [10000.0, 0.0, 2500.0]
+    assert rows.loc[4242, "live_counts"] == [1]
+    assert rows.loc[1005, "event_timestamp"] == now
+
+    # An hour later the stored buckets shift back by one
+    later = now + pd.Timedelta(hours=1)
+    stored = first[first["user_id"] == 1005].to_dict(orient="list")
+    second = add_to_live_buckets(
+        stored, events.iloc[:1].assign(event_timestamp=later), later
+    )
+    assert second.loc[0, "live_counts"] == [1, 1, 0, 1]
+    assert second.loc[0, "live_sums"] == [100.0, 100.0, 0.0, 50.0]
+
+
+@pytest.mark.unit
+def test_live_buckets_drop_hours_outside_window():
+    """Test that stored buckets older than the window are dropped on update."""
+    now = pd.Timestamp("2025-06-10 12:30", tz="UTC")
+    stored = {
+        "user_id": [1005],
+        "live_bucket_hour": [bucket_hour(now.timestamp()) - WINDOW_BUCKETS + 2],
+        "live_counts": [[1, 1, 1]],
+        "live_sums": [[10.0, 20.0, 30.0]],
+        "live_sum_sqs": [[100.0, 400.0, 900.0]],
+    }
+    events = pd.DataFrame(
+        {"user_id": [1005], "transaction_amount": [5.0], "event_timestamp": [now]}
+    )
+
+    row = add_to_live_buckets(stored, events, now).iloc[0]
+
+    assert len(row["live_counts"]) == WINDOW_BUCKETS
+    assert row["live_counts"][0] == 1
+    assert row["live_counts"][-2:] == [1, 1]
+    assert sum(row["live_counts"]) == 3
+    assert row["live_sums"][-2:] == [10.0, 20.0]
+
+
+@pytest.mark.unit
+def test_combine_live_aggregates_matches_recomputation():
+    """Test that live buckets newer than the batch row extend its statistics."""
+    rng = np.random.default_rng(0)
+    history = rng.uniform(10.0, 500.0, 30)
+    live = np.array([120.0, 480.0, 75.0])
+    now_s = pd.Timestamp("2025-06-10 12:30", tz="UTC").timestamp()
+    now_hour = bucket_hour(now_s)
+    batch_ts = (now_hour - 3) * 3600  # batch row computed three hours ago
+
+    features = {
+        "user_id": [1005],
+        "user_id__ts": [0],
+        "transaction_count_7d": [len(history)],
+        "transaction_count_7d__ts": [batch_ts],
+        "avg_transaction_amount_7d": [history.mean()],
+        "std_transaction_amount_7d": [history.std()],
+        "live_bucket_hour": [now_hour],
+        # Buckets 0-3 are new; bucket 4 predates the batch row and is
+        # already part of it
+        "live_counts": [[2, 0, 0, 1, 4]],
+        "live_sums": [[live[:2].sum(), 0.0, 0.0, live[2], 999.0]],
+        "live_sum_sqs": [[(live[:2] ** 2).sum(), 0.0, 0.0, live[2] ** 2, 999.0]],
+    }
+
+    combined = combine_live_aggregates(features, now_s)
+
+    expected = np.concatenate([history, live])
+    assert set(combined) == {
+        "user_id",
+        "transaction_count_7d",
+        "avg_transaction_amount_7d",
+        "std_transaction_amount_7d",
+    }
+    assert combined["transaction_count_7d"] == [33]
+    assert combined["avg_transaction_amount_7d"][0] == pytest.approx(expected.mean())
+    assert combined["std_transaction_amount_7d"][0] == pytest.approx(expected.std())
+
+    # A week later every live bucket has aged out, leaving the batch row
+    week_later = now_s + WINDOW_BUCKETS * 3600
+    aged = combine_live_aggregates(features, week_later)
+    assert aged["transaction_count_7d"] == [30]
+    assert aged["avg_transaction_amount_7d"][0] == pytest.approx(history.mean())
+
+
+@pytest.mark.unit
+def test_combine_live_aggregates_scores_users_without_batch_row():
+    """Test that a user known only from live events gets aggregates."""
+    now_s = pd.Timestamp("2025-06-10 12:30", tz="UTC").timestamp()
+    features = {
+        "user_id": [4242],
+        "transaction_count_7d": [None],
+        "transaction_count_7d__ts": [0],
+        "avg_transaction_amount_7d": [None],
+        "std_transaction_amount_7d": [None],
+        "live_bucket_hour": [bucket_hour(now_s)],
+        "live_counts": [[2]],
+        "live_sums": [[30.0]],
+        "live_sum_sqs": [[500.0]],
+    }
+
+    combined = combine_live_aggregates(features, now_s)
+
+    assert combined["transaction_count_7d"] == [2]
+    assert combined["avg_transaction_amount_7d"] == [15.0]
+    assert combined["std_transaction_amount_7d"] == [5.0]
+
+
+@pytest.mark.unit
+def test_within_window_clamps_future_and_drops_expired():
+    """Test that only events inside the 7-day window are kept, none in the future."""
+    now = pd.Timestamp("2025-06-10", tz="UTC")
+    events = pd.DataFrame(
+        {
+            "user_id": [1, 2, 3],
+            "transaction_amount": [10.0, 20.0, 30.0],
+            "event_timestamp": [
+                now - pd.Timedelta(days=1),
+                now - pd.Timedelta(days=8),
+                now + pd.Timedelta(days=365),
+            ],
+        }
+    )
+
+    kept = within_window(events, now)
+
+    assert kept["user_id"].tolist() == [1, 3]
+    assert kept["event_timestamp"].max() == now
+
+
+@pytest.mark.unit
+def test_ingest_endpoints_push_and_invalidate_cache(test_client, mock_feature_store):
+    """Test that ingested events are pushed as live buckets."""
+    import src.app as app_module
+
+    # Populate the fallback cache for the user
+    test_client.post("/predict", json={"user_id": 1005, "transaction_amount": 50.0})
+    assert app_module.feature_cache.get(1005) is not None
+
+    response = test_client.post(
+        "/ingest", json={"user_id": 1005, "transaction_amount": 300.0}
+    )
+    assert response.status_code == 202
+    assert response.json() == {"accepted": 1, "pending": 1}
+
+    response = test_client.post(
+        "/ingest/bulk",
+        json=[
+            {
+                "user_id": 1005,
+                "transaction_amount": 400.0,
+                "event_timestamp": datetime(
+                    2030, 1, 1, tzinfo=timezone.utc
+                ).isoformat(),
+            }
+        ],
+    )
+    assert response.status_code == 202
+    assert response.json()["pending"] == 2
+
+    before = pd.Timestamp.now(tz="UTC")
+    assert app_module.ingest_buffer.flush() == 2
+
+    mock_feature_store.push.assert_called_once()
+    args, kwargs = mock_feature_store.push.call_args
+    assert args[0] == "user_live_transactions_push"
+    pushed = args[1].set_index("user_id")
+    # The future event is clamped into the current hour's bucket
+    assert pushed.loc[1005, "live_counts"] == [2]
+    assert pushed.loc[1005, "live_sums"] == [700.0]
+    # Stamped with the flush time, not the (future) event time
+    assert before <= pushed.loc[1005, "event_timestamp"] <= pd.Timestamp.now(tz="UTC")
+    assert app_module.feature_cache.get(1005) is None
+
+    counters = test_client.get("/metrics").json()["counters"]
+    assert counters["ingest_events_flushed_total"] == 2
+
+
+@pytest.mark.unit
+def test_predict_adds_live_transactions(test_client, mock_feature_store):
+    """Test that /predict serves batch aggregates extended by live buckets."""
+    serve = mock_feature_store.get_online_features.side_effect
+
+    def with_live_buckets(features, entity_rows):
+        if features[0].startswith("user_live_transaction_features:"):
+            live = {
+                "user_id": [1005],
+                "live_bucket_hour": [bucket_hour(time.time())],
+                "live_counts": [[3]],
+                "live_sums": [[3 * 296.62]],
+                "live_sum_sqs": [[3 * 296.62**2]],
+            }
+            return MagicMock(to_dict=lambda **_: live)
+        return serve(features, entity_rows)
+
+    mock_feature_store.get_online_features.side_effect = with_live_buckets
+
+    response = test_client.post(
+        "/predict", json={"user_id": 1005, "transaction_amount": 50.0}
+    )
+
+    features = response.json()["features_fetched"]
+    assert features["transaction_count_7d"] == [40]
+    assert features["avg_transaction_amount_7d"][0] == pytest.approx(296.62)
+    assert "live_counts" not in features
+
+
+@pytest.mark.unit
+def test_ingest_drops_expired_events(test_client, mock_feature_store):
+    """Test that backfilled events outside the window are counted, not pushed."""
+    import src.app as app_module
+
+    test_client.post(
+        "/ingest/bulk",
+        json=[
+            {
+                "user_id": 1005,
+                "transaction_amount": 10.0,
+                "event_timestamp": "2025-01-01T12:00:00Z",
+            }
+        ],
+    )
+    app_module.ingest_buffer.flush()
+
+    mock_feature_store.push.assert_not_called()
+    counters = test_client.get("/metrics").json()["counters"]
+    assert counters["ingest_events_expired_total"] == 1
+
+
+@pytest.mark.unit
+def test_ingest_flushes_on_shutdown(test_client, mock_feature_store):
+    """Test that buffered events are flushed when the app shuts down."""
+    with test_client:
+        response = test_client.post(
+            "/ingest", json={"user_id": 1005, "transaction_amount": 300.0}
+        )
+        assert response.status_code == 202
+
+    mock_feature_store.push.assert_called_once()
+
+
+@pytest.mark.unit
+def test_ingest_invalid_event(test_client):
+    """Test that malformed events are rejected."""
+    response = test_client.post("/ingest", json={"user_id": 1005})
+    assert response.status_code == 422
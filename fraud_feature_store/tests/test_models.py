@@ -0,0 +1,201 @@
+"""Tests for model scoring, shadow models and the shadow score log."""
+
+import threading
+
+import pandas as pd
+import pytest
+
+from src.metrics import metrics
+from src.models import (
+    FraudModel,
+    ModelRegistry,
+    RuleBasedModel,
+    ShadowScorer,
+    load_model,
+)
+from src.parquet_log import RollingParquetWriter
+
+FEATURES = {
+    "user_id": [1005],
+    "transaction_count_7d": [37],
+    "avg_transaction_amount_7d": [296.62],
+    "amount_zscore_7d": [1.7],
+}
+
+
+class ConstantModel(FraudModel):
+    """Shadow stand-in that always returns the same score."""
+
+    def __init__(self, name, is_fraud=True, confidence=0.8):
+        self.name = name
+        self.version = "test"
+        self.result = (is_fraud, confidence)
+        self.seen = []
+
+    def score(self, features):
+        self.seen.append(features)
+        return self.result
+
+
+class ListLog:
+    def __init__(self):
+        self.rows = []
+
+    def add(self, rows):
+        self.rows.extend(rows)
+        return True
+
+
+@pytest.mark.unit
+def test_rule_based_model():
+    """Test the rules on average amount and request-time z-score."""
+    model = RuleBasedModel(amount_threshold=1000.0, zscore_threshold=4.0)
+
+    assert model.model_id == "rules:v1"
+    assert model.score(FEATURES) == (False, 0.5)
+    assert model.score({**FEATURES, "amount_zscore_7d": [4.5]}) == (True, 0.9)
+    assert model.score({**FEATURES, "avg_transaction_amount_7d": [1500.0]})[0]
+    assert model.score({**FEATURES, "amount_zscore_7d": [None]})[0] is False
+
+
+@pytest.mark.unit
+def test_registry_rejects_duplicate_models():
+    """Test that a model id can only be registered once."""
+    registry = ModelRegistry(RuleBasedModel())
+    registry.register_shadow(ConstantModel("a"))
+
+    with pytest.raises(ValueError):
+        registry.register_shadow(ConstantModel("a"))
+    with pytest.raises(ValueError):
+        registry.register_shadow(RuleBasedModel())
+
+
+# Loaded by path in test_load_model
+SHADOW_RULES = RuleBasedModel(name="shadow_rules", amount_threshold=500.0)
+
+
+@pytest.mark.unit
+def test_load_model():
+    """Test importing a model from a module:attribute path."""
+    assert load_model(f"{__name__}:SHADOW_RULES") is SHADOW_RULES
+
+
+@pytest.mark.unit
+def test_load_model_rejects_non_models():
+    """Test that a misconfigured path fails at load time, not per request."""
+    with pytest.raises(TypeError, match="ModelRegistry"):
+        load_model("src.app:model_registry")
+    with pytest.raises(TypeError):
+        ModelRegistry(RuleBasedModel()).register_shadow(object())
+
+
+@pytest.mark.unit
+def test_fraud_model_requires_score():
+    """Test that a model without ``score`` cannot be instantiated."""
+
+    class Unfinished(FraudModel):
+        pass
+
+    with pytest.raises(TypeError):
+        Unfinished()
+
+
+@pytest.mark.unit
+def test_shadow_scorer_logs_rows_per_model():
+    """Test that every shadow model scores once and is logged against the primary."""
+    metrics.reset()
+    registry = ModelRegistry(RuleBasedModel())
+    registry.register_shadow(ConstantModel("a"))
+    registry.register_shadow(ConstantModel("b", is_fraud=False, confidence=0.1))
+    log = ListLog()
+    scorer = ShadowScorer(registry, log)
+
+    assert scorer.submit({"request_id": "r1"}, FEATURES, (False, 0.5)) is True
+    scorer.shutdown()
+
+    assert [row["model"] for row in log.rows] == ["a:test", "b:test"]
+    row = log.rows[0]
+    assert row["request_id"] == "r1"
+    assert row["is_fraud"] is True
+    assert row["primary_model"] == "rules:v1"
+    assert row["primary_is_fraud"] is False
+    summaries = metrics.snapshot()["summaries"]
+    assert summaries['model_score_seconds{model="a:test"}']["count"] == 1
+
+
+@pytest.mark.unit
+def test_shadow_scorer_bounded_and_isolates_failures():
+    """Test that a full pool drops work and a failing model does not stop others."""
+    metrics.reset()
+    release = threading.Event()
+
+    class BlockingModel(ConstantModel):
+        def score(self, features):
+            release.wait(5)
+            raise RuntimeError("model exploded")
+
+    registry = ModelRegistry(RuleBasedModel())
+    registry.register_shadow(BlockingModel("blocking"))
+    registry.register_shadow(ConstantModel("ok"))
+    log = ListLog()
+    scorer = ShadowScorer(registry, log, max_workers=1, max_pending=1)
+
+    assert scorer.submit({}, FEATURES, (False, 0.5)) is True
+    assert scorer.submit({}, FEATURES, (False, 0.5)) is False
+    release.set()
+    scorer.shutdown()
+
+    assert metrics.get("shadow_dropped_total") == 1
+    assert metrics.get("shadow_errors_total", model="blocking:test") == 1
+    assert [row["model"] for row in log.rows] == ["ok:test"]
+
+
+@pytest.mark.unit
+def test_rolling_parquet_writer(tmp_path):
+    """Test that each batch lands in its own readable parquet file."""
+    writer = RollingParquetWriter(str(tmp_path / "log"), "scores")
+
+    first = writer.write([{"model": "a", "confidence": 0.5}])
+    second = writer.write([{"model": "b", "confidence": 0.9}])
+
+    assert first != second
+    df = pd.read_parquet(tmp_path / "log")
+    assert sorted(df["model"]) == ["a", "b"]
+
+
+@pytest.mark.unit
+def test_predict_runs_shadow_models_on_shared_features(
+    test_client, mock_feature_store, tmp_path
+):
+    """Test that shadow models reuse the primary's single feature fetch."""
+    import src.app as app_module
+
+    shadow = ConstantModel("candidate")
+    app_module.model_registry.register_shadow(shadow)
+
+    with test_client:
+        response = test_client.post(
+            "/predict", json={"user_id": 1005, "transaction_amount": 500.0}
+        )
+        data = response.json()
+        assert data["is_fraud"] is False
+        assert data["model"] == "rules:v1"
+        summaries = test_client.get("/metrics").json()["summaries"]
+        assert 'model_score_seconds{model="rules:v1"}' in summaries
+
+    # The lifespan shutdown drained the shadow pool and flushed the log
+    # Shadow models reuse the served features: one lookup per user view
+    assert mock_feature_store.get_online_features.call_count == 2
+    assert (
+        shadow.seen[0]["amount_zscore_7d"]
+        == data["features_fetched"]["amount_zscore_7d"]
+    )
+
+    logged = pd.read_parquet(tmp_path / "shadow_scores")
+    assert len(logged) == 1
+    row = logged.iloc[0]
+    assert row["request_id"] == data["request_id"]
+    assert row["model"] == "candidate:test"
+    assert bool(row["is_fraud"]) is True
+    assert bool(row["primary_is_fraud"]) is False
+    assert row["user_id"] == 1005
@@ -0,0 +1,63 @@
+"""Unit tests for request-time (on-demand) features."""
+
+import numpy as np
+import pytest
+
+from src.on_demand import (
+    REQUEST_FEATURES,
+    compute_request_features,
+    request_features_for,
+)
+
+
+@pytest.mark.unit
+def test_compute_request_features_batch():
+    """Test ratio, z-score and velocity over a batch."""
+    result = compute_request_features(
+        transaction_amount=[200.0, 50.0, 1000.0],
+        avg_transaction_amount_7d=[100.0, 100.0, 100.0],
+        std_transaction_amount_7d=[50.0, 25.0, 100.0],
+        transaction_count_7d=[10, 60, 51],
+        velocity_threshold=50,
+    )
+
+    assert set(result) == set(REQUEST_FEATURES)
+    np.testing.assert_allclose(result["amount_to_avg_ratio"], [2.0, 0.5, 10.0])
+    np.testing.assert_allclose(result["amount_zscore_7d"], [2.0, -2.0, 9.0])
+    assert result["exceeds_velocity_threshold"].tolist() == [False, True, True]
+
+
+@pytest.mark.unit
+def test_compute_request_features_missing_aggregates():
+    """Test that missing or zero aggregates yield NaN instead of raising."""
+    result = compute_request_features(
+        transaction_amount=[100.0, 100.0, 100.0],
+        avg_transaction_amount_7d=[None, 0.0, 50.0],
+        std_transaction_amount_7d=[None, None, None],
+        transaction_count_7d=[None, 0, 5],
+    )
+
+    ratio = result["amount_to_avg_ratio"]
+    zscore = result["amount_zscore_7d"]
+    assert np.isnan(ratio[0]) and np.isnan(ratio[1])
+    assert np.isnan(zscore[0]) and np.isnan(zscore[1])
+    # Without a deviation the mean is used as the scale
+    assert zscore[2] == pytest.approx(1.0)
+    assert result["exceeds_velocity_threshold"].tolist() == [False, False, False]
+
+
+@pytest.mark.unit
+def test_request_features_for_single_request():
+    """Test the single-request helper returns JSON-safe Feast-style lists."""
+    features = {
+        "transaction_count_7d": [None],
+        "avg_transaction_amount_7d": [None],
+    }
+
+    result = request_features_for(500.0, features)
+
+    assert result == {
+        "amount_to_avg_ratio": [None],
+        "amount_zscore_7d": [None],
+        "exceeds_velocity_threshold": [False],
+    }
@@ -0,0 +1,162 @@
+"""Tests for the asynchronous prediction log."""
+
+import os
+import time
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from src.metrics import metrics
+from src.parquet_log import RollingParquetWriter
+from src.prediction_log import PredictionLogger, RingBuffer, flatten_record
+
+
+@pytest.mark.unit
+def test_ring_buffer_fifo_and_wraparound():
+    """Test that items come out oldest first across the wrap point."""
+    ring = RingBuffer(3)
+    for item in [1, 2, 3]:
+        assert ring.put(item) is True
+    assert ring.drain(2) == [1, 2]
+
+    ring.put(4)
+    ring.put(5)
+    assert len(ring) == 3
+    assert ring.drain() == [3, 4, 5]
+    assert ring.drain() == []
+
+
+@pytest.mark.unit
+def test_ring_buffer_drops_on_overflow():
+    """Test that a full buffer drops new items and counts them."""
+    ring = RingBuffer(2)
+    ring.put("a")
+    ring.put("b")
+
+    assert ring.put("c") is False
+    assert ring.dropped == 1
+    assert ring.drain() == ["a", "b"]
+
+
+@pytest.mark.unit
+def test_flatten_record_fixed_columns():
+    """Test that every known feature gets a column, null when not served."""
+    row = flatten_record(
+        {"request_id": "r1", "features": {"avg_transaction_amount_7d": [296.6]}},
+        ["avg_transaction_amount_7d", "transaction_count_7d"],
+    )
+
+    assert row == {
+        "request_id": "r1",
+        "feature__avg_transaction_amount_7d": 296.6,
+        "feature__transaction_count_7d": None,
+    }
+
+
+@pytest.mark.unit
+def test_prediction_logger_writes_zstd_parquet(tmp_path):
+    """Test that flushed records land in zstd parquet files with drop counters."""
+    metrics.reset()
+    logger = PredictionLogger(
+        RollingParquetWriter(str(tmp_path), "predictions", compression="zstd"),
+        feature_names=["avg_transaction_amount_7d"],
+        capacity=2,
+        max_rows_per_file=1,
+    )
+    for request_id in ["r1", "r2", "r3"]:
+        logger.log(
+            {"request_id": request_id, "features": {"avg_transaction_amount_7d": [1.0]}}
+        )
+
+    assert logger.flush() == 2
+
+    files = sorted(tmp_path.iterdir())
+    assert len(files) == 2  # max_rows_per_file rolls to a new file
+    metadata = pq.ParquetFile(files[0]).metadata
+    assert metadata.row_group(0).column(0).compression == "ZSTD"
+    assert sorted(pd.read_parquet(tmp_path)["request_id"]) == ["r1", "r2"]
+    assert metrics.get("prediction_log_rows_written_total") == 2
+    assert metrics.get("prediction_log_dropped_total") == 1
+
+
+@pytest.mark.unit
+def test_rolling_writer_retention(tmp_path):
+    """Test that the oldest files are deleted beyond the count and age limits."""
+    writer = RollingParquetWriter(str(tmp_path), "predictions", max_files=2)
+    paths = [writer.write([{"request_id": f"r{i}"}]) for i in range(3)]
+
+    assert sorted(tmp_path.iterdir()) == sorted(map(type(tmp_path), paths[1:]))
+
+    # Anything past max_age_s goes too, other prefixes are left alone
+    (tmp_path / "notes.txt").write_text("keep")
+    week_ago = time.time() - 7 * 24 * 3600
+    os.utime(paths[1], (week_ago, week_ago))
+    writer.max_age_s = 3600
+    assert writer.enforce_retention() == 1
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+        [os.path.basename(paths[2]), "notes.txt"]
+    )
+
+    writer.max_bytes = 1
+    writer.write([{"request_id": "big"}])
+    assert [p.name for p in tmp_path.iterdir()] == ["notes.txt"]
+
+
+@pytest.mark.unit
+def test_log_files_share_one_schema_across_null_columns(tmp_path):
+    """Test that files whose all-null columns differ still read as one dataset."""
+    logger = PredictionLogger(
+        RollingParquetWriter(str(tmp_path), "predictions"),
+        feature_names=["avg_transaction_amount_7d", "merchant_fraud_rate_30d"],
+    )
+    # Healthy batch without merchants: degraded_reason and merchant feature null
+    logger.log(
+        {
+            "request_id": "r1",
+            "degraded": False,
+            "degraded_reason": None,
+            "features": {"avg_transaction_amount_7d": [296.6]},
+        }
+    )
+    logger.flush()
+    logger.log(
+        {
+            "request_id": "r2",
+            "degraded": True,
+            "degraded_reason": "timeout:rules",
+            "features": {"merchant_fraud_rate_30d": [0.02]},
+        }
+    )
+    logger.flush()
+
+    assert len(list(tmp_path.iterdir())) == 2
+    logged = pd.read_parquet(tmp_path).sort_values("request_id")
+    assert logged["degraded_reason"].tolist() == [None, "timeout:rules"]
+    assert logged["feature__merchant_fraud_rate_30d"].tolist()[1] == 0.02
+
+
+@pytest.mark.unit
+def test_predict_is_logged_off_the_request_path(test_client, tmp_path):
+    """Test that served features, score and latency are logged on flush."""
+    import src.app as app_module
+
+    ok = test_client.post(
+        "/predict", json={"user_id": 1005, "transaction_amount": 500.0}
+    ).json()
+    test_client.post("/predict", json={"user_id": 9999, "transaction_amount": 1.0})
+
+    # Nothing is written until the background flusher runs
+    assert not (tmp_path / "predictions").exists()
+    assert app_module.prediction_logger.flush() == 1
+
+    logged = pd.read_parquet(tmp_path / "predictions")
+    row = logged.iloc[0]
+    assert row["request_id"] == ok["request_id"]
+    assert row["model"] == "rules:v1"
+    assert bool(row["degraded"]) is False
+    assert row["latency_ms"] > 0
+    assert row["feature__avg_transaction_amount_7d"] == pytest.approx(296.62)
+    assert row["feature__amount_zscore_7d"] == pytest.approx(
+        ok["features_fetched"]["amount_zscore_7d"][0]
+    )
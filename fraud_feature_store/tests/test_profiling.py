@@ -0,0 +1,162 @@
+"""Tests for the opt-in profiling hooks."""
+
+import threading
+import time
+from collections import deque
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.profiling import (
+    ProfilerBusy,
+    SlowRequestProfiler,
+    format_collapsed,
+    sample_stacks,
+)
+
+
+def spin_until(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+@pytest.mark.unit
+def test_sample_stacks_captures_busy_thread():
+    """Test that the sampler attributes samples to the running function."""
+    stop = threading.Event()
+    worker = threading.Thread(target=spin_until, args=(stop,), name="busy-worker")
+    worker.start()
+    try:
+        stacks = sample_stacks(0.1, interval_s=0.001)
+    finally:
+        stop.set()
+        worker.join()
+
+    busy = {stack: n for stack, n in stacks.items() if stack.startswith("busy-worker;")}
+    assert busy
+    assert all("test_profiling.py:spin_until" in stack for stack in busy)
+
+    collapsed = format_collapsed(stacks)
+    first_line = collapsed.splitlines()[0]
+    stack, count = first_line.rsplit(" ", 1)
+    assert int(count) == max(stacks.values())
+
+
+@pytest.mark.unit
+def test_sample_stacks_single_session():
+    """Test that overlapping sampling sessions are refused."""
+    started = threading.Event()
+
+    def long_session():
+        started.set()
+        sample_stacks(0.3)
+
+    session = threading.Thread(target=long_session)
+    session.start()
+    started.wait()
+    time.sleep(0.05)
+    try:
+        with pytest.raises(ProfilerBusy):
+            sample_stacks(0.01)
+    finally:
+        session.join()
+
+
+@pytest.mark.unit
+def test_slow_request_profiler_keeps_only_slow_requests():
+    """Test that cProfile output is kept for requests over the threshold."""
+    inner = FastAPI()
+
+    @inner.get("/fast")
+    def fast():
+        return {}
+
+    @inner.get("/slow")
+    def slow():
+        time.sleep(0.3)
+        return {}
+
+    profiles = deque(maxlen=5)
+    inner.add_middleware(
+        SlowRequestProfiler, profiles=profiles, threshold_ms=200, sample_rate=1.0
+    )
+    client = TestClient(inner)
+
+    assert client.get("/fast").status_code == 200
+    assert client.get("/slow").status_code == 200
+
+    assert len(profiles) == 1
+    kept = profiles[0]
+    assert kept["path"] == "/slow"
+    assert kept["duration_ms"] >= 300
+    assert "cumulative" in kept["stats"]
+
+
+@pytest.mark.unit
+def test_slow_request_profiler_unsampled_requests_pass_through():
+    """Test that requests outside the sample are never profiled."""
+    inner = FastAPI()
+
+    @inner.get("/slow")
+    def slow():
+        time.sleep(0.03)
+        return {}
+
+    profiles = deque()
+    inner.add_middleware(
+        SlowRequestProfiler, profiles=profiles, threshold_ms=1, sample_rate=0.0
+    )
+
+    assert TestClient(inner).get("/slow").status_code == 200
+    assert not profiles
+
+
+@pytest.mark.unit
+def test_admin_profile_disabled_by_default(test_client):
+    """Test that the admin profiling endpoints are off unless enabled."""
+    assert (
+        test_client.get("/admin/profile", params={"seconds": 0.01}).status_code == 404
+    )
+    assert test_client.get("/admin/profile/slow").status_code == 404
+
+
+@pytest.mark.unit
+def test_admin_profile_returns_collapsed_stacks(test_client, monkeypatch):
+    """Test that an enabled sampling session returns collapsed stacks."""
+    import src.app as app_module
+
+    monkeypatch.setattr(app_module, "PROFILING_ENABLED", True)
+    monkeypatch.setattr(app_module, "ADMIN_TOKEN", "s3cret")
+    test_client.headers["X-Admin-Token"] = "s3cret"
+
+    response = test_client.get(
+        "/admin/profile", params={"seconds": 0.05, "interval_ms": 1}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    for line in response.text.splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert ";" in stack and int(count) > 0
+
+    assert test_client.get("/admin/profile", params={"seconds": 600}).status_code == 422
+    assert test_client.get("/admin/profile/slow").json() == []
+
+
+@pytest.mark.unit
+def test_admin_profile_requires_token(test_client, monkeypatch):
+    """Test that enabled admin endpoints still refuse callers without the token."""
+    import src.app as app_module
+
+    monkeypatch.setattr(app_module, "PROFILING_ENABLED", True)
+    params = {"seconds": 0.01}
+
+    # No token configured: nobody gets in
+    assert test_client.get("/admin/profile", params=params).status_code == 403
+    monkeypatch.setattr(app_module, "ADMIN_TOKEN", "s3cret")
+    assert test_client.get("/admin/profile", params=params).status_code == 403
+    wrong = {"X-Admin-Token": "guess"}
+    assert test_client.get("/admin/profile/slow", headers=wrong).status_code == 403
+
+    right = {"X-Admin-Token": "s3cret"}
+    assert test_client.get("/admin/profile/slow", headers=right).status_code == 200
@@ -0,0 +1,242 @@
+"""Tests for the circuit breaker and adaptive concurrency limiter."""
+
+import pytest
+
+from src.metrics import metrics
+from src.resilience import AdaptiveConcurrencyLimiter, CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker(
+        name="test",
+        window_size=10,
+        min_calls=4,
+        error_rate_threshold=0.5,
+        slow_call_s=0.1,
+        slow_call_rate_threshold=0.75,
+        open_duration_s=5.0,
+        half_open_max_calls=2,
+        clock=clock,
+    )
+
+
+@pytest.mark.unit
+def test_breaker_opens_on_error_rate(breaker):
+    """Test that the breaker trips once the error rate crosses the threshold."""
+    breaker.record_success(0.01)
+    breaker.record_failure()
+    breaker.record_success(0.01)
+    assert breaker.state == CircuitBreaker.CLOSED  # below min_calls
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.allow_request() is False
+
+
+@pytest.mark.unit
+def test_breaker_opens_on_slow_calls(breaker):
+    """Test that successful but slow calls also trip the breaker."""
+    for _ in range(3):
+        breaker.record_success(0.5)
+    breaker.record_success(0.01)
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+@pytest.mark.unit
+def test_breaker_half_open_recovers(breaker, clock):
+    """Test that successful trial calls close an open breaker."""
+    for _ in range(4):
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    clock.now += 5.0
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    # Only half_open_max_calls trial calls are let through
+    assert breaker.allow_request() is True
+    assert breaker.allow_request() is True
+    assert breaker.allow_request() is False
+
+    breaker.record_success(0.01)
+    breaker.record_success(0.01)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request() is True
+
+
+@pytest.mark.unit
+def test_breaker_half_open_failure_reopens(breaker, clock):
+    """Test that a failing trial call re-opens the breaker for a full period."""
+    for _ in range(4):
+        breaker.record_failure()
+    clock.now += 5.0
+    assert breaker.allow_request() is True
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now += 4.9
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+@pytest.mark.unit
+def test_breaker_state_metric(breaker):
+    """Test that the breaker state is exported as a gauge."""
+    assert metrics.get("circuit_breaker_state", breaker="test") == 0
+    for _ in range(4):
+        breaker.record_failure()
+    assert metrics.get("circuit_breaker_state", breaker="test") == 2
+
+
+@pytest.mark.unit
+def test_limiter_rejects_at_limit():
+    """Test that the limiter caps concurrent calls."""
+    limiter = AdaptiveConcurrencyLimiter(name="test", initial_limit=2)
+
+    assert limiter.try_acquire() is True
+    assert limiter.try_acquire() is True
+    assert limiter.try_acquire() is False
+    assert limiter.inflight == 2
+
+    limiter.cancel()
+    assert limiter.try_acquire() is True
+
+
+@pytest.mark.unit
+def test_limiter_aimd():
+    """Test additive increase on fast calls and multiplicative decrease on slow ones."""
+    limiter = AdaptiveConcurrencyLimiter(
+        name="test",
+        initial_limit=10,
+        min_limit=2,
+        max_limit=11,
+        latency_threshold_s=0.05,
+        backoff_ratio=0.5,
+    )
+
+    # Mostly idle limiter does not grow
+    limiter.try_acquire()
+    limiter.release(0.01)
+    assert limiter.limit == 10
+
+    # Busy limiter grows by one per healthy call, up to max_limit
+    for _ in range(6):
+        limiter.try_acquire()
+    limiter.release(0.01)
+    limiter.release(0.01)
+    assert limiter.limit == 11
+
+    limiter.release(0.2)
+    assert limiter.limit == 5
+    limiter.release(0.01, failed=True)
+    limiter.release(0.01, failed=True)
+    assert limiter.limit == 2  # floored at min_limit
+    assert metrics.get("concurrency_limit", limiter="test") == 2
+
+
+@pytest.mark.unit
+def test_predict_sheds_load_from_failing_store(
+    test_client, faulty_feature_store, monkeypatch
+):
+    """Test that a failing store trips the breaker and stops receiving calls."""
+    import src.app as app_module
+
+    monkeypatch.setattr(app_module, "fs", faulty_feature_store)
+    breaker = app_module.store_breaker
+
+    faulty_feature_store.error_every = 1
+    for _ in range(breaker.min_calls):
+        response = test_client.post(
+            "/predict", json={"user_id": 1005, "transaction_amount": 5.0}
+        )
+        assert response.json()["degraded_reason"] == "store_error:rules"
+    assert breaker.state == CircuitBreaker.OPEN
+
+    calls = faulty_feature_store.calls
+    response = test_client.post(
+        "/predict", json={"user_id": 1005, "transaction_amount": 5.0}
+    )
+    assert response.json()["degraded_reason"] == "circuit_open:rules"
+    assert faulty_feature_store.calls == calls
+
+    # Once the store heals, half-open trial calls close the breaker again
+    faulty_feature_store.error_every = 0
+    monkeypatch.setattr(breaker, "open_duration_s", 0.0)
+    for _ in range(breaker.half_open_max_calls):
+        response = test_client.post(
+            "/predict", json={"user_id": 1005, "transaction_amount": 5.0}
+        )
+        assert response.json()["degraded"] is False
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    gauges = test_client.get("/metrics").json()["gauges"]
+    assert gauges['circuit_breaker_state{breaker="user_transaction_features"}'] == 0
+    assert gauges['concurrency_inflight{limiter="user_transaction_features"}'] == 0
+
+
+@pytest.mark.unit
+def test_predict_sheds_load_from_slow_store(
+    test_client, faulty_feature_store, monkeypatch
+):
+    """Test that a slow but answering store shrinks the limit and opens the breaker."""
+    import src.app as app_module
+
+    monkeypatch.setattr(app_module, "fs", faulty_feature_store)
+    breaker, limiter = app_module.store_breaker, app_module.store_limiter
+    monkeypatch.setattr(breaker, "slow_call_s", 0.02)
+    monkeypatch.setattr(limiter, "latency_threshold_s", 0.02)
+
+    # Slower than the thresholds, well within the 2s budget
+    faulty_feature_store.latency_s = 0.05
+    for _ in range(breaker.min_calls):
+        response = test_client.post(
+            "/predict", json={"user_id": 1005, "transaction_amount": 5.0}
+        )
+        assert response.json()["degraded"] is False
+
+    assert limiter.limit < limiter.initial_limit
+    assert breaker.state == CircuitBreaker.OPEN
+    response = test_client.post(
+        "/predict", json={"user_id": 1005, "transaction_amount": 5.0}
+    )
+    assert response.json()["degraded_reason"] == "circuit_open:cache"
+
+
+@pytest.mark.unit
+def test_default_slow_call_threshold_is_below_budget():
+    """Test that the default slow-call threshold can trip before a timeout."""
+    import src.app as app_module
+
+    breaker = app_module.make_breaker("test")
+    assert breaker.slow_call_s < app_module.FEATURE_TIMEOUT_MS / 1000
+
+
+@pytest.mark.unit
+def test_predict_sheds_load_when_limiter_full(
+    test_client, faulty_feature_store, monkeypatch
+):
+    """Test that requests beyond the concurrency limit degrade immediately."""
+    import src.app as app_module
+
+    monkeypatch.setattr(app_module, "fs", faulty_feature_store)
+    for view in app_module.FEATURE_VIEWS:
+        for _ in range(view.limiter.limit):
+            view.limiter.try_acquire()
+
+    response = test_client.post(
+        "/predict", json={"user_id": 1005, "transaction_amount": 5.0}
+    )
+    assert response.json()["degraded_reason"] == "overload:rules"
+    assert faulty_feature_store.calls == 0
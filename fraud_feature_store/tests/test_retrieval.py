@@ -0,0 +1,186 @@
+"""Tests for concurrent multi-entity feature retrieval."""
+
+import asyncio
+import time
+
+import pytest
+
+from src.metrics import metrics
+from src.retrieval import EntityFeatureView, MultiEntityRetriever
+
+USER_VIEW = EntityFeatureView("user_id", "users", ["user_count"], required=True)
+MERCHANT_VIEW = EntityFeatureView("merchant_id", "merchants", ["merchant_rate"])
+
+
+class FakeFetch:
+    """Answers each view after ``delay_s``, failing views listed in ``fail``."""
+
+    def __init__(self, delay_s=0.0, fail=()):
+        self.delay_s = delay_s
+        self.fail = set(fail)
+        self.calls = []
+
+    async def __call__(self, view, entity_rows, timeout_s):
+        self.calls.append((view, entity_rows, timeout_s))
+        await asyncio.sleep(self.delay_s)
+        if view.feature_view in self.fail:
+            raise ConnectionError(f"{view.feature_view} is down")
+        ((entity, value),) = entity_rows[0].items()
+        return {
+            entity: [value],
+            **{name: [f"{view.feature_view}-{value}"] for name in view.features},
+        }
+
+
+def retrieve(fetch, entities):
+    retriever = MultiEntityRetriever(fetch, [USER_VIEW, MERCHANT_VIEW])
+    return asyncio.run(retriever.retrieve(entities, timeout_s=1.0))
+
+
+@pytest.mark.unit
+def test_retrieve_joins_views_looked_up_concurrently():
+    """Test that one lookup per view runs in parallel and results are joined."""
+    fetch = FakeFetch(delay_s=0.2)
+
+    start = time.perf_counter()
+    features = retrieve(fetch, {"user_id": 7, "merchant_id": 3})
+    elapsed = time.perf_counter() - start
+
+    assert features == {
+        "user_id": [7],
+        "user_count": ["users-7"],
+        "merchant_id": [3],
+        "merchant_rate": ["merchants-3"],
+    }
+    assert [call[1] for call in fetch.calls] == [
+        [{"user_id": 7}],
+        [{"merchant_id": 3}],
+    ]
+    assert elapsed < 0.35  # two 0.2s lookups, not serialized
+
+
+@pytest.mark.unit
+def test_retrieve_skips_entities_not_in_request():
+    """Test that views whose entity is missing or None are not looked up."""
+    fetch = FakeFetch()
+
+    features = retrieve(fetch, {"user_id": 7, "merchant_id": None})
+
+    assert len(fetch.calls) == 1
+    assert "merchant_rate" not in features
+
+
+@pytest.mark.unit
+def test_optional_view_failure_leaves_features_empty():
+    """Test that a failed optional view yields None features and a counter."""
+    metrics.reset()
+
+    features = retrieve(FakeFetch(fail={"merchants"}), {"user_id": 7, "merchant_id": 3})
+
+    assert features["user_count"] == ["users-7"]
+    assert features["merchant_rate"] == [None]
+    assert (
+        metrics.get("feature_view_lookup_failures_total", feature_view="merchants") == 1
+    )
+
+
+@pytest.mark.unit
+def test_required_view_failure_raises():
+    """Test that a failed required view fails the whole retrieval."""
+    with pytest.raises(ConnectionError):
+        retrieve(FakeFetch(fail={"users"}), {"user_id": 7, "merchant_id": 3})
+
+
+@pytest.mark.unit
+def test_duplicate_feature_names_rejected():
+    """Test that views sharing a feature name cannot be joined."""
+    clash = EntityFeatureView("device_id", "devices", ["user_count"])
+
+    with pytest.raises(ValueError, match="user_count"):
+        MultiEntityRetriever(FakeFetch(), [USER_VIEW, clash])
+
+
+@pytest.mark.unit
+def test_predict_fetches_every_named_entity(test_client, mock_feature_store):
+    """Test that /predict serves merchant and device features with the user's."""
+    response = test_client.post(
+        "/predict",
+        json={
+            "user_id": 1005,
+            "transaction_amount": 500.0,
+            "merchant_id": 42,
+            "device_id": "dev-00001",
+        },
+    )
+
+    assert response.status_code == 200
+    features = response.json()["features_fetched"]
+    assert features["avg_transaction_amount_7d"] == [296.62]
+    assert features["merchant_fraud_rate_30d"] == [0.02]
+    assert features["device_user_count_30d"] == [3]
+    assert mock_feature_store.get_online_features.call_count == 4
+
+
+@pytest.mark.unit
+def test_predict_survives_optional_view_outage(test_client, mock_feature_store):
+    """Test that a failing merchant lookup does not degrade the prediction."""
+    serve_user = mock_feature_store.get_online_features.side_effect
+
+    def merchant_down(features, entity_rows):
+        if "merchant_id" in entity_rows[0]:
+            raise ConnectionError("merchant shard down")
+        return serve_user(features, entity_rows)
+
+    mock_feature_store.get_online_features.side_effect = merchant_down
+
+    response = test_client.post(
+        "/predict",
+        json={"user_id": 1005, "transaction_amount": 500.0, "merchant_id": 42},
+    )
+
+    data = response.json()
+    assert response.status_code == 200
+    assert data["degraded"] is False
+    assert data["features_fetched"]["merchant_fraud_rate_30d"] == [None]
+
+
+@pytest.mark.unit
+def test_optional_view_outage_does_not_trip_user_breaker(
+    test_client, mock_feature_store
+):
+    """Test that a merchant outage opens only the merchant view's breaker."""
+    import src.app as app_module
+    from src.resilience import CircuitBreaker
+
+    serve_user = mock_feature_store.get_online_features.side_effect
+    merchant_calls = []
+
+    def merchant_down(features, entity_rows):
+        if "merchant_id" in entity_rows[0]:
+            merchant_calls.append(entity_rows)
+            raise ConnectionError("merchant shard down")
+        return serve_user(features, entity_rows)
+
+    mock_feature_store.get_online_features.side_effect = merchant_down
+    merchant_breaker = app_module.MERCHANT_FEATURE_VIEW.breaker
+
+    for _ in range(merchant_breaker.min_calls + 5):
+        response = test_client.post(
+            "/predict",
+            json={"user_id": 1005, "transaction_amount": 500.0, "merchant_id": 42},
+        )
+        assert response.json()["degraded"] is False
+
+    assert merchant_breaker.state == CircuitBreaker.OPEN
+    assert app_module.store_breaker.state == CircuitBreaker.CLOSED
+    # Once open, the merchant view is no longer called at all
+    assert len(merchant_calls) == merchant_breaker.min_calls
+
+    response = test_client.post(
+        "/predict", json={"user_id": 1005, "transaction_amount": 500.0}
+    )
+    assert response.json()["degraded"] is False
+
+    gauges = test_client.get("/metrics").json()["gauges"]
+    assert gauges['circuit_breaker_state{breaker="merchant_transaction_features"}'] == 2
+    assert gauges['circuit_breaker_state{breaker="user_transaction_features"}'] == 0
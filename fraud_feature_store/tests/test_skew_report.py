@@ -0,0 +1,117 @@
+"""Tests for the training-serving skew report."""
+
+import os
+import sys
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add scripts to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+
+@pytest.fixture
+def served():
+    now = datetime.now(timezone.utc)
+    return pd.DataFrame(
+        {
+            "request_id": ["r1", "r2", "r3"],
+            "user_id": [1005, 1006, 1007],
+            "served_at": [now, now, now],
+            "degraded": [False, False, False],
+            "feature__transaction_count_7d": [37, 12, None],
+            "feature__avg_transaction_amount_7d": [296.62, 150.0, 80.0],
+        }
+    )
+
+
+@pytest.mark.unit
+def test_compare_features(served):
+    """Test per-feature mismatch rates, differences and missing values."""
+    from skew_report import compare_features
+
+    offline = pd.DataFrame(
+        {
+            "request_id": ["r1", "r2", "r3"],
+            "transaction_count_7d": [37, 10, 5],
+            # float32 round trip must not count as skew
+            "avg_transaction_amount_7d": [
+                float(np.float32(296.62)),
+                150.0,
+                np.nan,
+            ],
+        }
+    )
+
+    report = compare_features(
+        served,
+        offline,
+        features=["transaction_count_7d", "avg_transaction_amount_7d"],
+    ).set_index("feature")
+
+    count = report.loc["transaction_count_7d"]
+    assert count["compared"] == 2
+    assert count["mismatch_rate"] == 0.5
+    assert count["max_abs_diff"] == 2
+    assert count["missing_online"] == 1
+
+    avg = report.loc["avg_transaction_amount_7d"]
+    assert avg["compared"] == 2
+    assert avg["mismatch_rate"] == 0.0
+    assert avg["missing_offline"] == 1
+
+
+@pytest.mark.unit
+def test_load_served_skips_degraded(tmp_path, served):
+    """Test that degraded predictions are left out of the comparison."""
+    from skew_report import load_served
+
+    served.loc[1, "degraded"] = True
+    served.to_parquet(tmp_path / "predictions.parquet")
+
+    assert load_served(str(tmp_path))["request_id"].tolist() == ["r1", "r3"]
+
+
+@pytest.mark.unit
+def test_load_served_reads_every_log_file(tmp_path):
+    """Test that a log directory with a degraded batch after a healthy one loads."""
+    from skew_report import load_served
+
+    from src.parquet_log import RollingParquetWriter
+    from src.prediction_log import PredictionLogger
+
+    logger = PredictionLogger(
+        RollingParquetWriter(str(tmp_path), "predictions"),
+        feature_names=["avg_transaction_amount_7d"],
+    )
+    for request_id, reason in [("r1", None), ("r2", "timeout:rules"), ("r3", None)]:
+        logger.log(
+            {
+                "request_id": request_id,
+                "served_at": datetime.now(timezone.utc),
+                "degraded": reason is not None,
+                "degraded_reason": reason,
+                "features": {},
+            }
+        )
+        logger.flush()
+
+    assert sorted(load_served(str(tmp_path))["request_id"]) == ["r1", "r3"]
+
+
+@pytest.mark.unit
+def test_fetch_offline_uses_serving_time(served):
+    """Test that offline features are looked up as of each request's time."""
+    from skew_report import FEATURE_VIEW, STORED_FEATURES, fetch_offline
+
+    store = MagicMock()
+    fetch_offline(store, served)
+
+    kwargs = store.get_historical_features.call_args.kwargs
+    entity_df = kwargs["entity_df"]
+    assert list(entity_df.columns) == ["request_id", "user_id", "event_timestamp"]
+    assert entity_df["event_timestamp"].equals(served["served_at"])
+    assert kwargs["features"] == [f"{FEATURE_VIEW}:{f}" for f in STORED_FEATURES]